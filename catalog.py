@@ -0,0 +1,64 @@
+"""
+설문 질문 카탈로그.
+constants.QUESTION_DEFINITIONS 를 import 시점에 한 번만 검증/인덱싱해 둔 읽기 전용 구조로,
+요청마다 정의 목록을 훑거나 정적인 질문 부분을 pydantic 으로 다시 검증하지 않는다.
+요청 시에는 미리 만든 템플릿에 사용자 답변만 model_copy(update=...) 로 채운다.
+(템플릿 인스턴스는 요청 간에 공유되므로 수정하지 말 것)
+"""
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from constants import QUESTION_DEFINITIONS
+from schemas import GroupInputOut, QuestionWithAnswerOut, SubQuestionOut
+
+QUESTIONS_BY_ID: Mapping[int, dict] = MappingProxyType({q["id"]: q for q in QUESTION_DEFINITIONS})
+
+# 섹션 이름 -> 질문 id 범위 (/survey/<섹션> 엔드포인트 구성)
+SECTION_RANGES: Mapping[str, Tuple[int, int]] = MappingProxyType({
+    "lifestyle": (1, 7),
+    "identify": (8, 20),
+    "preference": (21, 27),
+    "beliefs": (28, 33),
+})
+ESSAY_QUESTION_ID = 34
+
+SECTION_TEMPLATES: Mapping[str, Tuple[QuestionWithAnswerOut, ...]] = MappingProxyType({
+    name: tuple(
+        QuestionWithAnswerOut(**q)
+        for q in QUESTION_DEFINITIONS
+        if qmin <= q["id"] <= qmax
+    )
+    for name, (qmin, qmax) in SECTION_RANGES.items()
+})
+ESSAY_TEMPLATES: Tuple[SubQuestionOut, ...] = tuple(
+    SubQuestionOut(**sub) for sub in QUESTIONS_BY_ID[ESSAY_QUESTION_ID]["subQuestions"]
+)
+
+
+def fill_section(
+    name: str,
+    stored: Dict[int, List[str]],
+    is_text: bool = False
+) -> List[QuestionWithAnswerOut]:
+    """섹션 템플릿에 답변 채우기. 답변이 없는 질문은 템플릿을 그대로 쓴다"""
+    out = []
+    for template in SECTION_TEMPLATES[name]:
+        vals = stored.get(template.id)
+        if not vals:
+            out.append(template)
+            continue
+        out.append(template.model_copy(update={
+            "answer_ids": vals,
+            "text": vals[0] if is_text else None,
+        }))
+    return out
+
+
+def fill_essay(stored: Dict[int, Optional[str]]) -> GroupInputOut:
+    """34번(주관식) 서브 질문 템플릿에 텍스트 채우기"""
+    answers = [
+        template.model_copy(update={"text": stored[template.id]}) if stored.get(template.id) is not None
+        else template
+        for template in ESSAY_TEMPLATES
+    ]
+    return GroupInputOut.model_construct(question_id=ESSAY_QUESTION_ID, answers=answers)
@@ -1,6 +1,8 @@
-from fastapi import Cookie, HTTPException, Depends
-from jose import jwt
-from core.config import settings
+from fastapi import Cookie, HTTPException, Depends, WebSocketException, status
+from jose import JWTError
+from core.database import AsyncSessionLocal
+from core.security import verify_token
+from deps import CurrentUser, load_current_user
 
 async def get_current_user_from_ws(
     token: str = Cookie(None, alias="access_token")
@@ -13,7 +15,38 @@ async def get_current_user_from_ws(
     if not token:
         raise HTTPException(status_code=401, detail="Not authenticated")
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = verify_token(token)
         return payload["sub"]
     except Exception:
-        raise HTTPException(status_code=401, detail="Invalid token")
\ No newline at end of file
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+async def get_ws_user(
+    access_token: str = Cookie(None)
+):
+    """
+    장시간 유지되는 WebSocket용 사용자 인증:
+    - get_current_user 와 달리 get_session 에 의존하지 않고, 사용자 조회에만
+      짧은 세션을 열었다가 바로 반납 (오디오 루프 동안 커넥션을 점유하지 않음)
+    - 사용자 클레임이 있는 토큰은 DB 없이, 이전 형식 토큰은 REST 와 같은 사용자 캐시
+      (deps.load_current_user)로 CurrentUser 스냅샷을 만든다.
+      이후 DB 작업이 필요하면 AsyncSessionLocal() 로 그때그때 세션을 연다
+    - 실패 시 1008(policy violation) 으로 연결을 닫는다
+    """
+    if not access_token:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Not authenticated")
+    try:
+        payload = verify_token(access_token)
+        google_id = payload.get("sub")
+    except JWTError:
+        google_id = None
+    if not google_id:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid token")
+
+    user = CurrentUser.from_claims(payload)
+    if user is not None:
+        return user
+    async with AsyncSessionLocal() as db:
+        user = await load_current_user(db, google_id)
+    if not user:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="User not found")
+    return user
@@ -1,3 +1,5 @@
+from typing import Dict, Literal
+
 from pydantic_settings import BaseSettings
 from pydantic import AnyUrl, AnyHttpUrl, Field
 from dotenv import load_dotenv
@@ -12,7 +14,23 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
 
+    # deps.get_current_user 사용자 캐시 (google_id 기준, TTL 초)
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL: float = 300.0
+
+    # core.security.verify_token 검증 결과 캐시 (exp 없는 토큰은 MAX_TTL 초까지)
+    TOKEN_CACHE_SIZE: int = 10000
+    TOKEN_CACHE_MAX_TTL: float = 3600.0
+
     DATABASE_URL: AnyUrl
+    # SQLAlchemy 커넥션 풀 (기본값은 SQLAlchemy 기본과 동일, recycle -1 = 사용 안 함)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+    # asyncpg prepared statement 캐시 크기 (asyncpg 드라이버일 때만 적용)
+    DB_STATEMENT_CACHE_SIZE: int = 100
 
     FRONTEND_URL: str
     GOOGLE_APPLICATION_CREDENTIALS: str
@@ -21,7 +39,78 @@ class Settings(BaseSettings):
     AZURE_SPEECH_REGION: str
     AZURE_SPEECH_ENDPOINT: AnyUrl
 
+    # 실시간 STT 백엔드 선택: azure | nest (CLOVA Speech gRPC) | replay (부하 테스트용 가짜)
+    STT_BACKEND: Literal["azure", "nest", "replay"] = "azure"
+    # 클라이언트가 보내는 PCM16 mono 오디오 샘플레이트 (static/ws_test.html 의 SAMPLE_RATE)
+    SPEECH_SAMPLE_RATE: int = 16000
+    CLOVA_NEST_ENDPOINT: str = "clovaspeech-gw.ncloud.com:50051"
+    CLOVA_NEST_SECRET_KEY: str = ""
+    CLOVA_NEST_LANGUAGE: str = "ko"
+    CLOVA_NEST_QUEUE_MAXSIZE: int = 100
+    CLOVA_NEST_STOP_TIMEOUT: float = 3.0
+    # 요청 큐가 가득 찬 채로 이 시간(초) 동안 비지 않으면 스트림이 멈춘 것으로 보고 세션을 끝낸다
+    CLOVA_NEST_WRITE_TIMEOUT: float = 5.0
+
+    # replay 백엔드 (services/stt/replay_backend.py 참고)
+    STT_REPLAY_SCRIPT: str = ""
+    STT_REPLAY_CLOCK: Literal["audio", "wall"] = "audio"
+    STT_REPLAY_INTERVAL_MS: float = 3000
+    STT_REPLAY_FINALIZE_MS: float = 300
+    STT_REPLAY_LOOP: bool = True
+
     AI_SERVER_URL: str
+
+    # AI 서버용 공유 HTTP 클라이언트 (커넥션 풀)
+    AI_HTTP2: bool = True
+    AI_HTTP_MAX_CONNECTIONS: int = 100
+    AI_HTTP_MAX_KEEPALIVE: int = 20
+    AI_HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    AI_HTTP_TIMEOUT: float = 30.0
+    AI_HTTP_CONNECT_TIMEOUT: float = 5.0
+    AI_HTTP_POOL_TIMEOUT: float = 5.0
+
+    # 발화 파이프라인 단계별 타임아웃(초). 기본값 + 단계 이름별 덮어쓰기 (JSON)
+    AI_STAGE_TIMEOUT: float = 10.0
+    AI_STAGE_TIMEOUTS: Dict[str, float] = Field(default_factory=lambda: {"final_report": 30.0})
+
+    # 조언 상세 동시 조회: 세션당 / 워커 전체 상한 (0 이면 제한 없음)
+    AI_ADVICE_DETAIL_CONCURRENCY: int = 4
+    AI_ADVICE_DETAIL_GLOBAL_CONCURRENCY: int = 32
+    # 응답에 바로 포함할 조언 상세 수, 나머지는 지연 조회 (0 이면 전부 응답에 포함)
+    AI_ADVICE_DETAIL_INLINE_TOP_N: int = 0
+
+    # /ws/speech 에 stream 쿼리 파라미터가 없을 때의 기본 전송 모드
+    SPEECH_STREAM_DEFAULT: bool = False
+
+    # 세션별 전사 결과 큐: 크기와 가득 찼을 때 버릴 쪽
+    SPEECH_QUEUE_MAXSIZE: int = 8
+    SPEECH_QUEUE_OVERFLOW: Literal["drop_oldest", "drop_newest"] = "drop_oldest"
+
+    # 설문 답변 저장 방식
+    # - rows: 섹션별 테이블에 (질문, 선택지)당 1행 (기존)
+    # - compact: survey_section_answers 에 사용자 x 섹션당 JSON 1행.
+    #   기존 행은 compact 로 처음 저장할 때 옮겨지고, 일괄 이전은 tools/migrate_survey_compact.py
+    SURVEY_STORAGE: Literal["rows", "compact"] = "rows"
+
+    # 정적 카탈로그(/survey/questions, /partners/questions, /checklist/items) Cache-Control max-age(초).
+    # 만료 후에는 ETag 로 재검증하므로 배포로 내용이 바뀌면 다음 재검증 때 반영된다
+    CATALOG_CACHE_MAX_AGE: int = 3600
+
+    # 워커당 수용 한도 (0 이면 제한 없음)
+    # - SPEECH_MAX_SESSIONS 를 넘는 /ws/speech 연결은 1013 + retry_after 로 거절
+    # - AI_MAX_INFLIGHT_PIPELINES 에 걸리면 세션 워커가 자리가 날 때까지 대기
+    SPEECH_MAX_SESSIONS: int = 100
+    AI_MAX_INFLIGHT_PIPELINES: int = 64
+    SPEECH_RETRY_AFTER: int = 5
+
+    # 최종 보고서 생성 시점
+    # - per_utterance: 발화마다 생성 (기존 동작)
+    # - on_end: 세션 종료 / "end" 제어 프레임 / REST 요청 시에만
+    # - rolling: on_end + 발화 처리 중 최대 FINAL_REPORT_ROLLING_INTERVAL 초마다 갱신
+    FINAL_REPORT_MODE: Literal["per_utterance", "on_end", "rolling"] = "per_utterance"
+    FINAL_REPORT_ROLLING_INTERVAL: float = 60.0
+    FINAL_REPORT_CACHE_SIZE: int = 1024
+    FINAL_REPORT_CACHE_TTL: float = 6 * 60 * 60
     
     class Config:
         env_file = ".env"
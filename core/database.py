@@ -1,11 +1,94 @@
+import time
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from core.config import settings
+from core.metrics import Counter, Gauge, Histogram
+
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent obtaining a connection from the SQLAlchemy pool (including new connects)",
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Connection checkouts that gave up after DB_POOL_TIMEOUT",
+)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """체크아웃 대기 시간과 pool_timeout 초과 횟수를 기록하는 풀"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            DB_POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - start)
+
+
+def _engine_options(url: str) -> Dict[str, Any]:
+    parsed = make_url(url)
+    options: Dict[str, Any] = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    # sqlite 메모리 DB 등 큐 풀을 쓰지 않는 드라이버는 기본 풀 그대로
+    if issubclass(parsed.get_dialect().get_pool_class(parsed), QueuePool):
+        options.update(
+            poolclass=InstrumentedAsyncPool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    if parsed.get_driver_name() == "asyncpg":
+        # pgbouncer(transaction 모드) 뒤에서는 0 으로 꺼야 함
+        options["connect_args"] = {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+    return options
 
-engine = create_async_engine(str(settings.DATABASE_URL), echo=False)
+
+engine = create_async_engine(
+    str(settings.DATABASE_URL), echo=False, **_engine_options(str(settings.DATABASE_URL))
+)
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 Base = declarative_base()
 
 async def get_session():
     async with AsyncSessionLocal() as session:
         yield session
+
+
+def pool_stats() -> Dict[str, Any]:
+    """DB 커넥션 풀 현재 상태 (큐 풀이 아니면 status 문자열만)"""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__, "status": pool.status()}
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "timeout": pool.timeout(),
+    }
+
+
+def _pool_gauge(key: str):
+    def collect():
+        stats = pool_stats()
+        return {(): stats[key]} if key in stats else {}
+    return collect
+
+
+Gauge("db_pool_size", "Configured SQLAlchemy pool size", collect=_pool_gauge("size"))
+Gauge("db_pool_checked_out", "Connections currently checked out", collect=_pool_gauge("checked_out"))
+Gauge("db_pool_checked_in", "Idle connections held in the pool", collect=_pool_gauge("checked_in"))
+Gauge("db_pool_overflow", "Connections opened beyond pool_size", collect=_pool_gauge("overflow"))
@@ -0,0 +1,85 @@
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, Dict, Optional
+
+import httpx
+
+from core.config import settings
+
+# 앱 전체에서 공유하는 AI 서버용 클라이언트 (lifespan 에서 생성/종료)
+_client: Optional[httpx.AsyncClient] = None
+
+
+def build_ai_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=settings.AI_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.AI_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=settings.AI_HTTP_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(
+        settings.AI_HTTP_TIMEOUT,
+        connect=settings.AI_HTTP_CONNECT_TIMEOUT,
+        pool=settings.AI_HTTP_POOL_TIMEOUT,
+    )
+    # 여러 유저가 같은 클라이언트를 쓰므로 응답 쿠키는 절대 저장하지 않는다
+    no_store = CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+    return httpx.AsyncClient(
+        base_url=settings.AI_SERVER_URL.rstrip("/"),
+        http2=settings.AI_HTTP2,
+        limits=limits,
+        timeout=timeout,
+        cookies=httpx.Cookies(no_store),
+    )
+
+
+async def init_ai_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = build_ai_client()
+    return _client
+
+
+async def close_ai_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_ai_client() -> httpx.AsyncClient:
+    if _client is None:
+        raise RuntimeError("AI HTTP client is not initialized (app lifespan not started)")
+    return _client
+
+
+def cookie_headers(cookies: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """요청 단위 쿠키 전달: 공유 클라이언트의 쿠키 저장소 대신 Cookie 헤더로 보낸다"""
+    if not cookies:
+        return {}
+    return {"Cookie": "; ".join(f"{k}={v}" for k, v in cookies.items())}
+
+
+def pool_stats() -> Dict[str, Any]:
+    """
+    커넥션 풀 상태. httpcore 내부 객체를 읽으므로 버전에 따라 값이 없을 수 있음.
+    """
+    stats: Dict[str, Any] = {
+        "initialized": _client is not None,
+        "http2": settings.AI_HTTP2,
+        "max_connections": settings.AI_HTTP_MAX_CONNECTIONS,
+        "max_keepalive_connections": settings.AI_HTTP_MAX_KEEPALIVE,
+    }
+    if _client is None:
+        return stats
+    pool = getattr(getattr(_client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []) or [])
+    requests = list(getattr(pool, "_requests", []) or [])
+    queued = sum(1 for r in requests if r.is_queued())
+    stats.update(
+        connections=len(connections),
+        idle=sum(1 for c in connections if c.is_idle()),
+        active=sum(1 for c in connections if not c.is_idle() and not c.is_closed()),
+        http2_connections=sum(1 for c in connections if "HTTP/2" in c.info()),
+        requests_active=len(requests) - queued,
+        requests_queued=queued,
+    )
+    return stats
@@ -0,0 +1,59 @@
+import hashlib
+import time
+from typing import Any, Dict
+
+from cachetools import TLRUCache
+from jose import jwt
+
+from core.config import settings
+from core.metrics import Counter, Gauge
+
+
+def _expires_at(key: bytes, claims: Dict[str, Any], now: float) -> float:
+    # 토큰의 exp 까지만 캐시 (exp 가 없는 refresh token 등은 TOKEN_CACHE_MAX_TTL 까지)
+    limit = now + settings.TOKEN_CACHE_MAX_TTL
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        return min(float(exp), limit)
+    return limit
+
+
+# sha256(token) -> 검증된 클레임. 실패한 토큰은 캐시하지 않음
+_verified: TLRUCache = TLRUCache(
+    maxsize=settings.TOKEN_CACHE_SIZE, ttu=_expires_at, timer=time.time
+)
+
+TOKEN_CACHE_REQUESTS = Counter(
+    "jwt_verify_cache_requests_total",
+    "verify_token lookups by cache result",
+    ("result",),
+)
+
+
+def _hit_ratio() -> Dict[tuple, float]:
+    hits = TOKEN_CACHE_REQUESTS.value(result="hit")
+    total = hits + TOKEN_CACHE_REQUESTS.value(result="miss")
+    return {(): hits / total if total else 0.0}
+
+
+Gauge(
+    "jwt_verify_cache_hit_ratio",
+    "Share of verify_token calls served from the verified-claims cache",
+    collect=_hit_ratio,
+)
+
+
+def verify_token(token: str) -> Dict[str, Any]:
+    """
+    JWT 서명/만료 검증 후 클레임 반환 (실패 시 jose.JWTError).
+    같은 토큰이 요청마다 다시 오므로 검증 결과를 토큰 digest 기준으로 exp 까지 재사용
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    claims = _verified.get(key)
+    if claims is not None:
+        TOKEN_CACHE_REQUESTS.inc(result="hit")
+        return dict(claims)
+    TOKEN_CACHE_REQUESTS.inc(result="miss")
+    claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    _verified[key] = claims
+    return dict(claims)
@@ -0,0 +1,89 @@
+"""
+배포 사이에 바뀌지 않는 카탈로그(설문 질문, 파트너 질문, 체크리스트 항목)용 응답.
+import 시점에 한 번 검증/JSON 인코딩/gzip 압축해 두고, 요청마다 바이트를 그대로 내보낸다.
+ETag 는 내용 해시로 만들고, If-None-Match 가 맞으면 본문 없이 304 를 반환한다.
+"""
+import gzip
+import hashlib
+from typing import Any, Dict
+
+from fastapi import Request, Response, status
+from pydantic import TypeAdapter
+
+from core.config import settings
+
+
+def _etag_matches(if_none_match: str, etags) -> bool:
+    # If-None-Match 는 약한 비교 (RFC 9110 13.1.2): W/ 접두어는 무시
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in etags:
+            return True
+    return False
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Accept-Encoding 에서 gzip(또는 *) 의 q 값이 0 보다 큰지 (RFC 9110 12.5.3)"""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    q = accepted.get("gzip", accepted.get("x-gzip", accepted.get("*", 0.0)))
+    return q > 0
+
+
+class StaticJSON:
+    """
+    정적 JSON 카탈로그 1개.
+    - response_model 로 한 번 검증해 FastAPI 와 같은 compact JSON 으로 인코딩
+    - gzip 본문은 압축 결과가 더 작을 때만 사용
+    - 표현(identity / gzip)마다 다른 강한 ETag (같은 해시 + "-gzip")
+    """
+
+    def __init__(self, response_model: Any, content: Any, private: bool = False):
+        adapter = TypeAdapter(response_model)
+        self.body = adapter.dump_json(adapter.validate_python(content))
+        digest = hashlib.sha256(self.body).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        gzipped = gzip.compress(self.body, compresslevel=9, mtime=0)
+        self.gzip_body = gzipped if len(gzipped) < len(self.body) else None
+        self.gzip_etag = f'"{digest}-gzip"'
+        # 인증이 필요한 엔드포인트는 공유 캐시(프록시/CDN)에 남지 않도록 private
+        scope = "private" if private else "public"
+        self.cache_control = f"{scope}, max-age={settings.CATALOG_CACHE_MAX_AGE}"
+
+    def _headers(self, etag: str) -> Dict[str, str]:
+        return {
+            "ETag": etag,
+            "Cache-Control": self.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+
+    def response(self, request: Request) -> Response:
+        use_gzip = self.gzip_body is not None and _accepts_gzip(request.headers.get("accept-encoding", ""))
+        etag = self.gzip_etag if use_gzip else self.etag
+
+        if_none_match = request.headers.get("if-none-match")
+        # 이번에 고른 표현(identity / gzip)의 ETag 와 맞을 때만 304 (RFC 9111 4.3.4)
+        if if_none_match and _etag_matches(if_none_match, (etag,)):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self._headers(etag))
+
+        if use_gzip:
+            headers = {**self._headers(etag), "Content-Encoding": "gzip"}
+            return Response(self.gzip_body, media_type="application/json", headers=headers)
+        return Response(self.body, media_type="application/json", headers=self._headers(etag))
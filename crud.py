@@ -1,7 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import delete
+from sqlalchemy import Integer, String, Text, cast, delete, insert, literal, literal_column, null, union_all
 from datetime import date, time
+from core.config import settings
 from models import (
     User, ProfileInitial,
     LifestyleAnswer, TraitAnswer,
@@ -9,10 +10,12 @@ from models import (
     IntroductionAnswer,
     Partner, PartnerAnswer,
     ChecklistItem, UserChecklist,
-    GroupInputAnswer, Schedule
+    GroupInputAnswer, Schedule,
+    SurveySectionAnswer
 )
 from schemas import ChoiceAnswerIn, ProfileIn, SubQuestionAnswerIn
-from typing import Dict, List
+import json
+from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy.orm import selectinload
 
 # --- 유저 ---
@@ -27,6 +30,81 @@ async def create_user(db: AsyncSession, google_id, email, name, picture):
     await db.refresh(user)
     return user
 
+# --- 공통: 단일 문장 upsert ---
+async def upsert_returning(
+    db: AsyncSession,
+    model_cls,
+    values: Dict[str, Any],
+    conflict_cols: Tuple[str, ...],
+    update_cols: Tuple[str, ...]
+):
+    """
+    conflict_cols 유니크 키 기준 INSERT ... ON CONFLICT DO UPDATE 한 문장으로 저장하고 ORM 객체를 반환합니다.
+    - postgresql / sqlite(3.35+): ON CONFLICT DO UPDATE ... RETURNING
+    - mysql / mariadb: ON DUPLICATE KEY UPDATE 후 유니크 키로 다시 조회 (RETURNING 미지원)
+    커밋까지 수행
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        stmt = dialect_insert(model_cls).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(conflict_cols),
+            set_={c: stmt.excluded[c] for c in update_cols}
+        ).returning(model_cls)
+        r = await db.execute(stmt, execution_options={"populate_existing": True})
+        obj = r.scalars().one()
+    elif dialect in ("mysql", "mariadb"):
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        stmt = mysql_insert(model_cls).values(**values)
+        await db.execute(stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in update_cols}))
+        r = await db.execute(
+            select(model_cls)
+            .filter_by(**{c: values[c] for c in conflict_cols})
+            .execution_options(populate_existing=True)
+        )
+        obj = r.scalars().one()
+    else:
+        raise NotImplementedError(f"upsert not supported for dialect: {dialect}")
+    await db.commit()
+    return obj
+
+
+async def insert_ignore_conflicts(
+    db: AsyncSession,
+    model_cls,
+    rows: List[Dict[str, Any]],
+    conflict_cols: Tuple[str, ...]
+) -> None:
+    """
+    conflict_cols 유니크 키가 이미 있는 행은 건너뛰고 한 문장으로 일괄 INSERT 합니다 (커밋은 호출 측).
+    - postgresql / sqlite: ON CONFLICT (...) DO NOTHING
+    - mysql / mariadb: 키 컬럼을 그대로 두는 ON DUPLICATE KEY UPDATE (INSERT IGNORE 는 다른 오류까지 삼킴)
+    """
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        stmt = dialect_insert(model_cls).values(rows).on_conflict_do_nothing(
+            index_elements=list(conflict_cols)
+        )
+    elif dialect in ("mysql", "mariadb"):
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        key = conflict_cols[0]
+        stmt = mysql_insert(model_cls).values(rows).on_duplicate_key_update(
+            {key: model_cls.__table__.c[key]}
+        )
+    else:
+        raise NotImplementedError(f"upsert not supported for dialect: {dialect}")
+    await db.execute(stmt)
+
 # --- 프로필 ---
 async def get_profile(db: AsyncSession, user_id: int) -> ProfileInitial | None:
     r = await db.execute(
@@ -34,43 +112,135 @@ async def get_profile(db: AsyncSession, user_id: int) -> ProfileInitial | None:
     )
     return r.scalars().first()
 
-async def upsert_basic(
+async def save_profile(
     db: AsyncSession,
     user_id: int,
-    data: ProfileIn            
+    data: ProfileIn
 ) -> ProfileInitial:
-    p = await get_profile(db, user_id)
-    if p:
-        p.name   = data.name
-        p.age    = data.age
-        p.gender = data.gender
-    else:
-        p = ProfileInitial(
-            user_id=user_id,
-            name=data.name,
-            age=data.age,
-            gender=data.gender
+    """기본 + 추가 정보를 한 문장(한 트랜잭션)으로 저장하고 저장된 행을 반환"""
+    fields = ("name", "age", "gender", "job", "region", "mbti", "smoking")
+    return await upsert_returning(
+        db, ProfileInitial,
+        {"user_id": user_id, **{f: getattr(data, f) for f in fields}},
+        ("user_id",),
+        fields
+    )
+
+# --- 설문 공통 ---
+AnswerKey = Tuple[Any, ...]
+# get_survey_answers 에서 34번(주관식) 답변 행의 section 값
+ESSAY_SECTION = "essay"
+
+
+async def _sync_answer_rows(
+    db: AsyncSession,
+    model_cls,
+    stored: List[Tuple[int, AnswerKey]],
+    desired: List[AnswerKey],
+    key_cols: Tuple[str, ...],
+    fixed: Dict[str, Any]
+) -> bool:
+    """
+    저장된 행 (id, key) 과 제출된 key 목록을 질문(key[0]) 단위로 비교해서 바뀐 질문만 반영합니다.
+    - 값 순서는 제출 순서 = id 순서로 유지 (조회 쪽은 id 순으로 읽음)
+      그대로인 질문은 건드리지 않고, 기존 값 뒤에 덧붙이기만 했으면 새 값만 추가,
+      그 밖에 바뀐 질문은 행을 지우고 제출 순서대로 다시 넣음
+    - 빠진 행은 id IN (...) 로 삭제, 새 행은 multi-VALUES INSERT 로 추가
+    - postgresql: 삭제와 추가를 WITH stale AS (DELETE ...) INSERT ... 한 문장으로 보냄
+      그 외: DELETE / INSERT 각각 한 번 (SQLite/MySQL 은 DML CTE 미지원)
+    - 결과 행/순서는 기존 delete 후 재삽입과 같다
+    stored 조회(호출 측) + 쓰기 1~2 문장 + 커밋 1번
+    변경이 있었으면 True
+    """
+    stored_by_q: Dict[Any, List[Tuple[int, AnswerKey]]] = {}
+    for row_id, key in sorted(stored):
+        stored_by_q.setdefault(key[0], []).append((row_id, key))
+    desired_by_q: Dict[Any, List[AnswerKey]] = {}
+    for key in desired:
+        desired_by_q.setdefault(key[0], []).append(key)
+
+    stale_ids: List[int] = []
+    new_keys: List[AnswerKey] = []
+    for question in {**desired_by_q, **stored_by_q}:
+        rows = stored_by_q.get(question, [])
+        have = [key for _, key in rows]
+        want = desired_by_q.get(question, [])
+        if want[:len(have)] == have:
+            new_keys.extend(want[len(have):])
+        else:
+            stale_ids.extend(row_id for row_id, _ in rows)
+            new_keys.extend(want)
+    new_rows = [{**fixed, **dict(zip(key_cols, key))} for key in new_keys]
+    if not stale_ids and not new_rows:
+        return False
+    stale = delete(model_cls).where(model_cls.id.in_(stale_ids)) if stale_ids else None
+    if stale is not None and new_rows and db.get_bind().dialect.name == "postgresql":
+        await db.execute(
+            insert(model_cls).values(new_rows).add_cte(stale.returning(model_cls.id).cte("stale"))
         )
-        db.add(p)
+    else:
+        if stale is not None:
+            await db.execute(stale)
+        if new_rows:
+            await db.execute(insert(model_cls).values(new_rows))
     await db.commit()
-    await db.refresh(p)
-    return p
+    return True
+
+
+# SURVEY_STORAGE=compact: 행 단위 답변 테이블 -> survey_section_answers.section
+SURVEY_SECTIONS = {
+    LifestyleAnswer: "lifestyle",
+    TraitAnswer: "trait",
+    PreferenceAnswer: "preference",
+    ValuesAnswer: "values",
+    IntroductionAnswer: "introduction",
+}
+
+
+def _compact_section(model_cls) -> Optional[str]:
+    if settings.SURVEY_STORAGE != "compact":
+        return None
+    return SURVEY_SECTIONS.get(model_cls)
 
-async def upsert_extra(
+
+async def _get_section_row(
+    db: AsyncSession, user_id: int, section: str
+) -> Optional[SurveySectionAnswer]:
+    r = await db.execute(
+        select(SurveySectionAnswer).where(
+            SurveySectionAnswer.user_id == user_id,
+            SurveySectionAnswer.section == section
+        )
+    )
+    return r.scalars().first()
+
+
+async def _upsert_section(
     db: AsyncSession,
     user_id: int,
-    data: ProfileIn            
-) -> ProfileInitial:
-    p = await get_profile(db, user_id)
-    p.job     = data.job
-    p.region  = data.region
-    p.mbti    = data.mbti
-    p.smoking = data.smoking
-    await db.commit()
-    await db.refresh(p)
-    return p
+    model_cls,
+    section: str,
+    desired: List[AnswerKey]
+) -> None:
+    data: Dict[str, List[str]] = {}
+    for question_id, value in desired:
+        data.setdefault(str(question_id), []).append(value)
+    row = await _get_section_row(db, user_id, section)
+    if row is not None and row.data == data:
+        return
+    if row is None:
+        # 이 섹션의 첫 compact 저장: 행 단위로 남아 있던 답변은 새 행으로 대체 (지연 이전)
+        await db.execute(delete(model_cls).where(model_cls.user_id == user_id))
+    # 동시에 첫 저장을 하거나 이전 도구와 겹쳐도 유니크 키 충돌 없이 한 문장으로 기록
+    await upsert_returning(
+        db,
+        SurveySectionAnswer,
+        {"user_id": user_id, "section": section, "data": data},
+        conflict_cols=("user_id", "section"),
+        update_cols=("data",)
+    )
+
 
-# --- 설문 공통 ---
 async def upsert_answers(
     db: AsyncSession,
     user_id: int,
@@ -78,26 +248,23 @@ async def upsert_answers(
     model_cls,
     is_text: bool = False
 ) -> int:
-    await db.execute(delete(model_cls).where(model_cls.user_id == user_id))
-    objs = []
     if is_text:
-        for a in answers:
-            objs.append(model_cls(
-                user_id=user_id,
-                question_id=a.question_id,
-                text=a.text
-            ))
+        key_cols = ("question_id", "text")
+        desired = [(a.question_id, a.text) for a in answers]
     else:
-        for a in answers:
-            for oid in a.option_ids:
-                objs.append(model_cls(
-                    user_id=user_id,
-                    question_id=a.question_id,
-                    option_id=oid
-                ))
-    db.add_all(objs)
-    await db.commit()
-    return len(objs)
+        key_cols = ("question_id", "option_id")
+        desired = [(a.question_id, oid) for a in answers for oid in a.option_ids]
+    section = _compact_section(model_cls)
+    if section is not None:
+        await _upsert_section(db, user_id, model_cls, section, desired)
+        return len(desired)
+    r = await db.execute(
+        select(model_cls.id, *(getattr(model_cls, c) for c in key_cols))
+        .where(model_cls.user_id == user_id)
+    )
+    stored = [(row[0], tuple(row[1:])) for row in r.all()]
+    await _sync_answer_rows(db, model_cls, stored, desired, key_cols, {"user_id": user_id})
+    return len(desired)
 
 
 async def get_user_answers(
@@ -105,7 +272,13 @@ async def get_user_answers(
     user_id: int,
     model
 ) -> Dict[int, List[str]]:
-    r = await db.execute(select(model).where(model.user_id == user_id))
+    section = _compact_section(model)
+    if section is not None:
+        row = await _get_section_row(db, user_id, section)
+        if row is not None:
+            return {int(qid): list(vals) for qid, vals in row.data.items()}
+        # 아직 compact 로 저장한 적 없는 사용자: 기존 테이블에서 읽음
+    r = await db.execute(select(model).where(model.user_id == user_id).order_by(model.id))
     rows = r.scalars().all()
     d: Dict[int, List[str]] = {}
     for row in rows:
@@ -115,6 +288,67 @@ async def get_user_answers(
     return d
 
 
+async def get_survey_answers(
+    db: AsyncSession,
+    user_id: int,
+    sections: Dict[str, Any]
+) -> Tuple[Dict[str, Dict[int, List[str]]], Dict[int, Optional[str]]]:
+    """
+    설문 스냅샷용: sections(이름 -> 답변 모델)의 답변과 34번 주관식 답변을
+    UNION ALL 쿼리 한 번으로 읽습니다. (section, question_id, value) 행으로 통일하고,
+    compact 모드면 survey_section_answers 행(question_id NULL, value=JSON)도 같이 읽어 우선 적용
+    반환: ({섹션: {question_id: [값...]}}, {sub_question_id: text})
+    """
+    parts = []
+    for name, model in sections.items():
+        value = model.text if hasattr(model, "text") else model.option_id
+        parts.append(
+            select(
+                literal(name, String).label("section"),
+                model.question_id.label("question_id"),
+                cast(value, Text).label("value"),
+                model.id.label("row_id")
+            ).where(model.user_id == user_id)
+        )
+        compact = _compact_section(model)
+        if compact is not None:
+            parts.append(
+                select(
+                    literal(name, String),
+                    cast(null(), Integer),
+                    cast(SurveySectionAnswer.data, Text),
+                    SurveySectionAnswer.id
+                ).where(
+                    SurveySectionAnswer.user_id == user_id,
+                    SurveySectionAnswer.section == compact
+                )
+            )
+    parts.append(
+        select(
+            literal(ESSAY_SECTION, String),
+            GroupInputAnswer.sub_question_id,
+            cast(GroupInputAnswer.text, Text),
+            GroupInputAnswer.id
+        ).where(GroupInputAnswer.user_id == user_id, GroupInputAnswer.question_id == 34)
+    )
+    # 같은 질문의 값은 한 테이블에서 오므로 id 순 = 제출 순서
+    r = await db.execute(union_all(*parts).order_by(literal_column("row_id")))
+
+    answers: Dict[str, Dict[int, List[str]]] = {name: {} for name in sections}
+    compact_data: Dict[str, Dict[str, List[str]]] = {}
+    essay: Dict[int, Optional[str]] = {}
+    for section, question_id, value, _ in r.all():
+        if section == ESSAY_SECTION:
+            essay[question_id] = value
+        elif question_id is None:
+            compact_data[section] = json.loads(value)
+        else:
+            answers[section].setdefault(question_id, []).append(value)
+    for section, data in compact_data.items():
+        answers[section] = {int(qid): list(vals) for qid, vals in data.items()}
+    return answers, essay
+
+
 async def get_group_input_answers(
     db: AsyncSession, user_id: int
 ) -> Dict[int, str]:
@@ -130,21 +364,17 @@ async def upsert_group_input_answers(
     user_id: int,
     answers: List[SubQuestionAnswerIn]
 ) -> int:
-    await db.execute(
-        delete(GroupInputAnswer).filter_by(user_id=user_id, question_id=34)
+    r = await db.execute(
+        select(GroupInputAnswer.id, GroupInputAnswer.sub_question_id, GroupInputAnswer.text)
+        .filter_by(user_id=user_id, question_id=34)
     )
-    objs = [
-        GroupInputAnswer(
-            user_id=user_id,
-            question_id=34,
-            sub_question_id=a.sub_question_id,
-            text=a.text
-        )
-        for a in answers
-    ]
-    db.add_all(objs)
-    await db.commit()
-    return len(objs)
+    stored = [(row_id, (sub_id, text)) for row_id, sub_id, text in r.all()]
+    desired = [(a.sub_question_id, a.text) for a in answers]
+    await _sync_answer_rows(
+        db, GroupInputAnswer, stored, desired,
+        ("sub_question_id", "text"), {"user_id": user_id, "question_id": 34}
+    )
+    return len(desired)
 
 # --- 파트너 ---
 async def create_partner_with_answers(
@@ -186,23 +416,19 @@ async def upsert_partner_answers(
         # 없으면 신규 생성
         return await create_partner_with_answers(db, user_id, answers)
 
-    # 기존 답변 삭제 후 새로 삽입
-    await db.execute(
-        delete(PartnerAnswer)
-        .where(PartnerAnswer.partner_id == partner.id)
+    # 기존 답변과 비교해서 바뀐 것만 반영 (answers 는 selectin 으로 이미 로드됨)
+    stored = [(a.id, (a.question_id, a.option_id)) for a in partner.answers]
+    desired = [
+        (ans.question_id, oid)
+        for ans in answers
+        for oid in (ans.option_ids or ([ans.option_id] if ans.option_id else []))
+    ]
+    changed = await _sync_answer_rows(
+        db, PartnerAnswer, stored, desired,
+        ("question_id", "option_id"), {"partner_id": partner.id}
     )
-    objs = []
-    for ans in answers:
-        ids = ans.option_ids or ([ans.option_id] if ans.option_id else [])
-        for oid in ids:
-            objs.append(PartnerAnswer(
-                partner_id=partner.id,
-                question_id=ans.question_id,
-                option_id=oid
-            ))
-    db.add_all(objs)
-    await db.commit()
-    await db.refresh(partner)
+    if changed:
+        await db.refresh(partner)
     return partner
 
 async def get_all_partners(
@@ -237,30 +463,18 @@ async def upsert_schedule(
     meeting_time: time,
     meeting_place: str
 ) -> Schedule:
-    # 이미 user_id로 저장된 스케줄 조회
-    r = await db.execute(
-        select(Schedule).where(Schedule.user_id == user_id)
+    # 사용자당 1건 (schedules.user_id 유니크)
+    return await upsert_returning(
+        db, Schedule,
+        {
+            "user_id": user_id,
+            "meeting_date": meeting_date,
+            "meeting_time": meeting_time,
+            "meeting_place": meeting_place,
+        },
+        ("user_id",),
+        ("meeting_date", "meeting_time", "meeting_place")
     )
-    sched = r.scalars().first()
-
-    if sched:
-        # 있으면 수정
-        sched.meeting_date  = meeting_date
-        sched.meeting_time  = meeting_time
-        sched.meeting_place = meeting_place
-    else:
-        # 없으면 신규 생성
-        sched = Schedule(
-            user_id=user_id,
-            meeting_date=meeting_date,
-            meeting_time=meeting_time,
-            meeting_place=meeting_place
-        )
-        db.add(sched)
-
-    await db.commit()
-    await db.refresh(sched)
-    return sched
 
 async def get_schedule_by_user(
     db: AsyncSession,
@@ -284,16 +498,10 @@ async def get_user_checklist(db: AsyncSession, user_id: int) -> list[UserCheckli
 async def upsert_user_check(
     db: AsyncSession, user_id: int, item_id: int, checked: bool
 ) -> None:
-    r = await db.execute(
-        select(UserChecklist).where(
-            UserChecklist.user_id == user_id,
-            UserChecklist.item_id == item_id
-        )
+    # (user_id, item_id) 유니크
+    await upsert_returning(
+        db, UserChecklist,
+        {"user_id": user_id, "item_id": item_id, "checked": checked},
+        ("user_id", "item_id"),
+        ("checked",)
     )
-    rec = r.scalars().first()
-    if rec:
-        rec.checked = checked
-    else:
-        rec = UserChecklist(user_id=user_id, item_id=item_id, checked=checked)
-        db.add(rec)
-    await db.commit()
\ No newline at end of file
@@ -1,32 +1,120 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from cachetools import TTLCache
 from fastapi import Cookie, Depends, HTTPException
-from jose import jwt, JWTError
+from jose import JWTError
+from sqlalchemy import event, inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.config import settings
 from core.database import get_session
+from core.metrics import Counter
+from core.security import verify_token
 from crud import get_user_by_google_id
+from models import User
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """
+    인증된 사용자 스냅샷. 요청 간에 캐시되므로 ORM 객체 대신 컬럼 값만 담는다
+    (라우터에서는 id / email / name / picture 만 사용)
+    """
+    id: int
+    google_id: str
+    email: str
+    name: str
+    picture: Optional[str] = None
+
+    @classmethod
+    def from_orm(cls, user: User) -> "CurrentUser":
+        return cls(user.id, user.google_id, user.email, user.name, user.picture)
+
+    @classmethod
+    def from_claims(cls, payload: Dict[str, Any]) -> Optional["CurrentUser"]:
+        """access token 클레임으로 복원. uid 가 없는 이전 형식 토큰이면 None"""
+        if payload.get("uid") is None or not payload.get("sub"):
+            return None
+        return cls(
+            payload["uid"], payload["sub"],
+            payload.get("email", ""), payload.get("name", ""), payload.get("picture")
+        )
+
+    def claims(self) -> Dict[str, Any]:
+        """access token 에 넣을 클레임 (exp 제외)"""
+        return {
+            "sub": self.google_id,
+            "uid": self.id,
+            "email": self.email,
+            "name": self.name,
+            "picture": self.picture,
+        }
+
+
+# google_id -> CurrentUser. 없는 사용자(404)는 캐시하지 않음
+_user_cache: TTLCache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL)
+
+USER_CACHE_REQUESTS = Counter(
+    "user_cache_requests_total",
+    "get_current_user principal lookups by cache result",
+    ("result",),
+)
+
+
+def invalidate_user(google_id: Optional[str]) -> None:
+    if google_id:
+        _user_cache.pop(google_id, None)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper, connection, target: User) -> None:
+    # google_id 자체가 바뀐 경우 이전 키도 제거
+    for google_id in inspect(target).attrs.google_id.history.deleted or ():
+        invalidate_user(google_id)
+    invalidate_user(target.google_id)
+
+
+async def load_current_user(db: AsyncSession, google_id: str) -> Optional[CurrentUser]:
+    """캐시 우선 조회. 캐시 미스일 때만 DB 에서 읽어 스냅샷으로 저장"""
+    principal = _user_cache.get(google_id)
+    if principal is not None:
+        USER_CACHE_REQUESTS.inc(result="hit")
+        return principal
+    USER_CACHE_REQUESTS.inc(result="miss")
+    user = await get_user_by_google_id(db, google_id)
+    if not user:
+        return None
+    principal = CurrentUser.from_orm(user)
+    _user_cache[google_id] = principal
+    return principal
+
 
 async def get_current_user(
     access_token: str = Cookie(None),
     db: AsyncSession = Depends(get_session)
-):
+) -> CurrentUser:
     if not access_token:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
     try:
-        payload = jwt.decode(
-            access_token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
+        payload = verify_token(access_token)
         google_id = payload.get("sub")
         if not google_id:
             raise HTTPException(status_code=401, detail="Invalid token")
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    user = await get_user_by_google_id(db, google_id)
+    # uid 등 사용자 클레임이 있는 토큰은 DB 를 거치지 않는다
+    user = CurrentUser.from_claims(payload)
+    if user is not None:
+        return user
+
+    # 이전 형식 토큰(sub 만 있음): 캐시 → DB. 캐시 히트면 세션은 커넥션을 체크아웃하지 않는다
+    user = await load_current_user(db, google_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     return user
+
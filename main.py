@@ -2,11 +2,10 @@ from dotenv import load_dotenv
 load_dotenv(".env")
 
 import json
-import asyncio
 import contextlib
+from contextlib import asynccontextmanager
 from datetime import datetime
 
-import httpx
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Depends
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
@@ -15,39 +14,38 @@ from starlette.middleware.sessions import SessionMiddleware
 from fastapi.openapi.utils import get_openapi
 from jose import jwt
 
-import azure.cognitiveservices.speech as speechsdk
-from azure.cognitiveservices.speech import PropertyId
-from azure.cognitiveservices.speech.audio import PushAudioInputStream, AudioConfig
-from azure.cognitiveservices.speech.transcription import ConversationTranscriber
-
 from core.config import settings
 from core.database import engine, Base
-from routers import auth, profile, survey, partner, checklist, schedules, conversation
-from deps import get_current_user
+from core.http_client import init_ai_client, close_ai_client
+from core.auth_ws import get_ws_user
+from routers import auth, profile, survey, partner, checklist, schedules, conversation, metrics, health
+from services.admission import admission, reject_busy
+from services.speech_session import SpeechSession, send_frame
+from services.speech_pipeline import handle_ai_pipeline, handle_control_frame
+from services.final_report import generate_in_background
+from services.stt import SttResult, SttStreamError, create_stt_backend
 
 # logger
 import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("rendi_api")
 
-speech_config = speechsdk.SpeechConfig(
-    subscription=settings.AZURE_SPEECH_KEY,
-    region=settings.AZURE_SPEECH_REGION
-)
-speech_config.speech_recognition_language = "ko-KR"
-speech_config.set_property(
-    PropertyId.SpeechServiceResponse_DiarizeIntermediateResults, "true"
-)
-speech_config.set_service_property(
-    "Speech_SegmentationSilenceTimeoutMs", "500",
-    speechsdk.ServicePropertyChannel.UriQueryParameter
-)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await init_ai_client()
+    try:
+        yield
+    finally:
+        await close_ai_client()
 
 app = FastAPI(
     title="Rendi API",
     version="1.0",
     openapi_url="/openapi.json",
     docs_url="/docs",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -73,141 +71,88 @@ app.add_middleware(
 # async def ws_test_page():
 #     return FileResponse("static/ws_test.html")
 
-@app.on_event("startup")
-async def on_startup():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
 @app.websocket("/ws/speech")
 async def speech_ws(
     websocket: WebSocket,
-    user = Depends(get_current_user)
+    user = Depends(get_ws_user)
 ):
+    # get_ws_user 는 사용자 조회 후 DB 커넥션을 바로 반납 (세션 내내 풀을 점유하지 않음)
+    # 워커당 동시 세션 상한: 넘으면 STT/AI 자원을 만들기 전에 1013 으로 거절
+    if not admission.try_open_session():
+        await reject_busy(websocket)
+        return
+    try:
+        await serve_speech_session(websocket, user)
+    finally:
+        admission.close_session()
+
+
+async def serve_speech_session(websocket: WebSocket, user):
     await websocket.accept()
-    session_cookies = websocket.cookies
-    loop = asyncio.get_running_loop()
-
-    # STT: Push stream setup
-    push_stream = PushAudioInputStream()
-    audio_input = AudioConfig(stream=push_stream)
-    transcriber = ConversationTranscriber(speech_config, audio_input)
-
-    def on_transcribed(evt):
-        # only final recognized speech
-        if evt.result.reason != speechsdk.ResultReason.RecognizedSpeech:
-            return
-        speaker = evt.result.speaker_id or "Guest-1"
-        if speaker == "Guest-1":
-            role_label = "나"
-        else:
-            role_label = "파트너"
+
+    # 세션당 AI 대화 1개: STT 준비와 병행해서 미리 생성
+    stream = websocket.query_params.get("stream")
+    session = SpeechSession(
+        websocket, user, websocket.cookies,
+        stream=settings.SPEECH_STREAM_DEFAULT if stream is None else stream.lower() in ("1", "true")
+    )
+    session.start()
+    session.start_worker(handle_ai_pipeline)
+
+    # STT: 백엔드는 settings.STT_BACKEND 로 선택 (azure / nest)
+    def on_transcribed(result: SttResult):
+        role_label = "나" if result.is_self else "파트너"
         message_payload = {
             "message": {
                 "message_id": datetime.utcnow().isoformat(),
                 "role": role_label,
-                "content": evt.result.text,
+                "content": result.text,
                 "timestamp": datetime.utcnow().isoformat()
             }
         }
-        loop.create_task(handle_ai_pipeline(websocket, message_payload, session_cookies))
-    
-    transcriber.transcribed.connect(on_transcribed)
-    transcriber.start_transcribing_async()
+        # SDK 스레드 → 이벤트 루프 (세션 큐)
+        session.submit_threadsafe(message_payload)
 
+    stt = None
+    close_code = 1000
     try:
+        # 백엔드 생성 실패(설정 오류 등)도 아래 finally 에서 세션/수용 슬롯을 정리하도록 try 안에서 생성
+        stt = create_stt_backend(on_transcribed)
+        await stt.start()
         while True:
-            data = await websocket.receive_bytes()
-            push_stream.write(data)
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+            if frame.get("bytes") is not None:
+                await stt.write(frame["bytes"])
+            elif frame.get("text"):
+                # 오디오 외 제어 메시지(JSON). "end" 면 보고서 전송 후 종료
+                if await handle_control_frame(session, frame["text"]):
+                    break
     except WebSocketDisconnect:
         logger.info("Client disconnected: %s", user.id)
+    except SttStreamError as e:
+        # 인식 스트림이 끊김: 더 받을 수 없으므로 알리고 1011 로 닫는다
+        logger.error("STT stream failed (%s): %s", session.conversation_id, e)
+        await send_frame(websocket, "error", None, error="speech recognition unavailable")
+        close_code = 1011
     finally:
-        push_stream.close()
-        transcriber.stop_transcribing_async()
+        # 세션이 소유한 AI 작업부터 취소 (이후 도착하는 전사 결과는 무시됨)
+        await session.close()
+        if stt is not None:
+            try:
+                await stt.stop()
+            except Exception as e:
+                logger.warning("STT stop error: %s", e)
+        # 보고서를 미루는 모드에서 "end" 없이 끊긴 경우: 나중에 조회할 수 있도록 미리 생성
+        if (
+            settings.FINAL_REPORT_MODE != "per_utterance"
+            and not session.ended
+            and session.messages_posted
+        ):
+            generate_in_background(session.user.id, session.conversation_id, session.cookies)
         with contextlib.suppress(RuntimeError):
-            await websocket.close()
-
-async def safe_send(ws: WebSocket, data: dict):
-    try:
-        await ws.send_json(data)
-    except RuntimeError:
-        # 이미 close된 상태라면 무시
-        logging.info("WebSocket already closed; cannot send message.")
-      
-async def handle_ai_pipeline(
-    ws: WebSocket,
-    payload: dict,
-    session_cookies: dict
-):
-    base = settings.AI_SERVER_URL.rstrip("/")
-    envelope = {}
-    try:
-        async with httpx.AsyncClient(cookies=session_cookies) as client:
-            # 1) 대화 생성
-            import uuid
-            conv_id = str(uuid.uuid4())
-            init = await client.post(f"{base}/api/v1/conversation/{conv_id}", json={})
-            init.raise_for_status()
-
-            # 2) 메시지 전송
-            msg = await client.post(
-                f"{base}/api/v1/conversation/{conv_id}/messages",
-                json=payload
-            )
-            msg.raise_for_status()
-            envelope.update(msg.json())
-
-            # 3) 실시간 메모리
-            mem = await client.post(
-                f"{base}/api/v1/conversation/{conv_id}/realtime-memory", json={}
-            )
-            mem.raise_for_status()
-            envelope['partner_memory'] = mem.json().get('partner_memory', {})
-
-            # 4) 실시간 분석
-            ana = await client.get(f"{base}/api/v1/conversation/{conv_id}/realtime-analysis")
-            ana.raise_for_status()
-            envelope['analysis'] = ana.json().get('scores', {})
-
-            # 5) 조언 추천
-            rec = await client.post(
-                f"{base}/api/v1/conversation/{conv_id}/breaktime-advice/recommendation"
-            )
-            rec.raise_for_status()
-            advice_list = rec.json().get('advice_metadatas', [])
-            envelope['advice_metadatas'] = advice_list
-            '''
-            # 6) 조언 상세
-            if advice_list:
-                aid = advice_list[0]['advice_id']
-                det = await client.post(
-                    f"{base}/api/v1/conversation/{conv_id}/breaktime-advice/{aid}"
-                )
-                det.raise_for_status()
-                envelope['advice_detail'] = det.json()
-            '''
-            advice_details = []
-            for advice in advice_list:
-                aid = advice.get('advice_id')
-                det = await client.post(
-                    f"{base}/api/v1/conversation/{conv_id}/breaktime-advice/{aid}"
-                )
-                det.raise_for_status()
-                advice_details.append(det.json())
-            envelope['advice_details'] = advice_details
-            # 7) 최종 보고서
-            fin = await client.post(
-                f"{base}/api/v1/conversation/{conv_id}/final-report", json={}
-            )
-            fin.raise_for_status()
-            envelope['final_report'] = fin.json().get('final_report', '')
-    except Exception as e:
-        logger.error("AI pipeline error: %s", e)
-        await ws.send_json({"error": str(e)})
-        return
-    envelope['message'] = payload['message']
-    await safe_send(ws, envelope)
-    # envelope['message'] = payload['message']
-    # await ws.send_json(envelope)
+            await websocket.close(code=close_code)
 
 # 라우터
 app.include_router(auth.router)
@@ -217,6 +162,8 @@ app.include_router(partner.router)
 app.include_router(checklist.router)
 app.include_router(schedules.router)
 app.include_router(conversation.router)
+app.include_router(metrics.router)
+app.include_router(health.router)
 
 # OpenAPI
 def custom_openapi():
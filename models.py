@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Date, Text, ForeignKey, Time
+from sqlalchemy import Column, Integer, String, Boolean, Date, Text, ForeignKey, Time, JSON, UniqueConstraint
 from sqlalchemy.orm import relationship
 from core.database import Base
 
@@ -75,6 +75,18 @@ class IntroductionAnswer(Base):
     question_id = Column(Integer, index=True)
     text        = Column(Text)
 
+class SurveySectionAnswer(Base):
+    """
+    SURVEY_STORAGE=compact 일 때 설문 섹션별 답변 (사용자 x 섹션당 1행).
+    data: {"<question_id>": [option_id 또는 text, ...]} (constants.QUESTION_DEFINITIONS 의 id 기준)
+    """
+    __tablename__ = "survey_section_answers"
+    __table_args__ = (UniqueConstraint("user_id", "section", name="uq_survey_section_user"),)
+    id      = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    section = Column(String(32), nullable=False)
+    data    = Column(JSON, nullable=False, default=dict)
+
 class GroupInputAnswer(Base):
     __tablename__ = "group_input_answers"
     id              = Column(Integer, primary_key=True, index=True)
@@ -93,12 +105,13 @@ class Partner(Base):
         back_populates="partner",
         cascade="all,delete-orphan",
         lazy="selectin",
+        order_by="PartnerAnswer.id",
     )
 
 class Schedule(Base):
     __tablename__ = "schedules"
     id             = Column(Integer, primary_key=True, index=True)
-    user_id        = Column(Integer, ForeignKey("users.id"), index=True)
+    user_id        = Column(Integer, ForeignKey("users.id"), unique=True)
     meeting_date   = Column(Date, nullable=False)
     meeting_time   = Column(Time, nullable=False)
     meeting_place  = Column(String, nullable=False)
@@ -121,6 +134,7 @@ class ChecklistItem(Base):
 
 class UserChecklist(Base):
     __tablename__ = "user_checklists"
+    __table_args__ = (UniqueConstraint("user_id", "item_id", name="uq_user_checklist_item"),)
     id         = Column(Integer, primary_key=True, index=True)
     user_id    = Column(Integer, ForeignKey("users.id"), index=True)
     item_id    = Column(Integer, ForeignKey("checklist_items.id"), index=True)
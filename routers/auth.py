@@ -7,7 +7,9 @@ from datetime import datetime, timedelta
 
 from core.config import settings
 from core.database import get_session
+from core.security import verify_token
 from crud import get_user_by_google_id, create_user, get_profile
+from deps import CurrentUser, load_current_user
 from schemas import TokenOut
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
@@ -66,7 +68,12 @@ async def callback(request: Request, db=Depends(get_session)):
 
     # JWT 생성
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_jwt = jwt.encode({"sub": google_id, "exp": expire}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    # 라우터가 쓰는 사용자 정보(uid/email/name/picture)를 담아 요청마다 DB 조회를 생략
+    access_jwt = jwt.encode(
+        {**CurrentUser.from_orm(user).claims(), "exp": expire},
+        settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM
+    )
     refresh_jwt = jwt.encode({"sub": google_id}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
     # 프로필 존재 여부
@@ -114,17 +121,22 @@ async def logout():
     response_model=TokenOut,
     summary="토큰 재발급"
 )
-async def refresh_token(refresh_token: str = Cookie(None)):
+async def refresh_token(refresh_token: str = Cookie(None), db=Depends(get_session)):
     if not refresh_token:
         raise HTTPException(status_code=401, detail="Refresh token missing")
     try:
-        data = jwt.decode(refresh_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        data = verify_token(refresh_token)
         user_sub = data["sub"]
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid refresh token")
 
+    # 재발급 시점의 사용자 정보로 클레임을 채움 (이름/사진 변경은 여기서 반영)
+    user = await load_current_user(db, user_sub)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+
     new_access = jwt.encode(
-        {"sub": user_sub, "exp": datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)},
+        {**user.claims(), "exp": datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)},
         settings.SECRET_KEY,
         algorithm=settings.ALGORITHM
     )
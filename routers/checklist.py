@@ -1,25 +1,29 @@
-from fastapi import APIRouter, Depends, status, Response
+from fastapi import APIRouter, Depends, Request, status, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from constants import CHECKLIST_ITEMS
 from deps import get_current_user
 from core.database import get_session
+from core.static_response import StaticJSON
 from crud import get_all_items, get_user_checklist, upsert_user_check
 from schemas import UserChecklistStatus, ToggleChecklistIn, ChecklistItemOut
 
 router = APIRouter(prefix="/checklist", tags=["checklist"])
 
+_ITEMS_RESPONSE = StaticJSON(List[ChecklistItemOut], CHECKLIST_ITEMS)
+
 @router.get(
     "/items",
     response_model=List[ChecklistItemOut],
     summary="체크리스트 기본 항목 리스트 조회"
 )
-async def list_default_items():
+async def list_default_items(request: Request):
     """
     체크리스트에 사용할 기본 항목 텍스트 목록을 반환합니다.
+    미리 인코딩/압축해 둔 본문을 ETag 와 함께 내보내며, If-None-Match 가 맞으면 304.
     """
-    return CHECKLIST_ITEMS
+    return _ITEMS_RESPONSE.response(request)
 
 @router.get(
     "",
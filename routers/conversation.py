@@ -1,6 +1,6 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from typing import Any, Dict
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from schemas import (
     ConversationCreate,
@@ -19,8 +19,8 @@ from services.session_services import (
     get_realtime_memory,
     get_realtime_analysis,
     get_breaktime_recommendation,
-    create_final_report,
 )
+from services.final_report import get_final_report
 from deps import get_current_user
 
 router = APIRouter(
@@ -33,12 +33,13 @@ router = APIRouter(
     summary="새 대화 세션 생성"
 )
 async def post_conversation(
-    payload: ConversationCreate
+    payload: ConversationCreate,
+    request: Request
 ) -> ConversationOut:
     """
     새로운 conversation session 을 생성합니다.
     """
-    raw = await create_conversation(payload.dict())
+    raw = await create_conversation(str(uuid4()), payload.dict(), cookies=request.cookies)
     return ConversationOut(**raw)
 
 @router.post(
@@ -48,12 +49,13 @@ async def post_conversation(
 )
 async def post_message(
     conversation_id: UUID,
-    payload: MessageIn
+    payload: MessageIn,
+    request: Request
 ) -> ConversationOut:
     """
     대화에 메시지를 추가하고, 전체 AI 응답을 반환합니다.
     """
-    raw = await add_message(conversation_id, payload.dict())
+    raw = await add_message(conversation_id, payload.dict(), cookies=request.cookies)
     if raw is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
@@ -85,11 +87,12 @@ async def post_message(
 async def realtime_memory(
     conversation_id: UUID,
     payload: RealTimeMemoryIn,
+    request: Request,
 ) -> RealTimeMemoryIn:
     """
     사용자 발화에 대한 실시간 메모리를 저장합니다.
     """
-    memory = await get_realtime_memory(conversation_id, payload.dict())
+    memory = await get_realtime_memory(conversation_id, payload.dict(), cookies=request.cookies)
     return RealTimeMemoryIn(extra_context=memory)
 
 @router.get(
@@ -98,12 +101,13 @@ async def realtime_memory(
     summary="실시간 분석 조회",
 )
 async def realtime_analysis(
-    conversation_id: UUID
+    conversation_id: UUID,
+    request: Request
 ) -> RealTimeAnalysisOut:
     """
     현재 conversation 에 대한 실시간 분석 결과를 조회합니다.
     """
-    scores = await get_realtime_analysis(conversation_id)
+    scores = await get_realtime_analysis(conversation_id, cookies=request.cookies)
     return RealTimeAnalysisOut(analysis=scores)
 
 @router.post(
@@ -114,11 +118,12 @@ async def realtime_analysis(
 async def breaktime_recommendation(
     conversation_id: UUID,
     payload: BreaktimeRecommendationIn,
+    request: Request,
 ) -> BreaktimeRecommendationOut:
     """
     중간 휴식에 대한 조언(추천)을 생성합니다.
     """
-    advices = await get_breaktime_recommendation(conversation_id, payload.dict())
+    advices = await get_breaktime_recommendation(conversation_id, payload.dict(), cookies=request.cookies)
     return BreaktimeRecommendationOut(advice_recommendations=advices)
 
 @router.post(
@@ -129,9 +134,15 @@ async def breaktime_recommendation(
 async def final_report(
     conversation_id: UUID,
     payload: FinalReportIn,
+    request: Request,
+    user=Depends(get_current_user),
 ) -> FinalReportOut:
     """
     대화 세션이 끝난 뒤 최종 보고서를 생성합니다.
+    같은 사용자가 같은 옵션으로 이미 생성한 보고서가 있으면 캐시된 결과를 반환합니다.
     """
-    report = await create_final_report(conversation_id, payload.dict())
-    return FinalReportOut(final_report=report.get("final_report", ""))
+    # 기본값은 생략: 바디 없이 만든 세션 보고서({})와 같은 캐시 키가 되도록
+    report = await get_final_report(
+        user.id, conversation_id, payload.dict(exclude_defaults=True), cookies=request.cookies
+    )
+    return FinalReportOut(final_report=report)
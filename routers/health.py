@@ -0,0 +1,25 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from core.config import settings
+from services.admission import admission
+
+router = APIRouter(tags=["health"])
+
+@router.get(
+    "/ready",
+    summary="워커 수용 가능 여부 (로드밸런서 readiness)"
+)
+async def readiness():
+    """
+    세션/AI 파이프라인 상한에 도달했으면 503 과 Retry-After 를 반환합니다.
+    본문에는 현재 사용량이 들어 있어 워커별 포화도를 확인할 수 있습니다.
+    """
+    body = admission.snapshot()
+    if body["ready"]:
+        return body
+    return JSONResponse(
+        body,
+        status_code=503,
+        headers={"Retry-After": str(settings.SPEECH_RETRY_AFTER)}
+    )
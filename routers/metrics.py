@@ -0,0 +1,39 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from core.database import pool_stats as db_pool_stats
+from core.http_client import pool_stats
+from core.metrics import render_prometheus
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+@router.get(
+    "",
+    response_class=PlainTextResponse,
+    summary="Prometheus 메트릭"
+)
+async def prometheus_metrics():
+    return PlainTextResponse(
+        render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+@router.get(
+    "/ai-client",
+    summary="AI 서버 HTTP 커넥션 풀 상태"
+)
+async def ai_client_stats():
+    """
+    공유 AI 클라이언트의 커넥션/요청 수를 반환합니다. (풀 사이즈 튜닝용)
+    """
+    return pool_stats()
+
+@router.get(
+    "/db",
+    summary="DB 커넥션 풀 상태"
+)
+async def db_pool():
+    """
+    SQLAlchemy 풀의 체크아웃/오버플로 현황을 반환합니다. (풀 고갈 확인용)
+    """
+    return db_pool_stats()
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from deps import get_current_user
 from core.database import get_session
+from core.static_response import StaticJSON
 from schemas import (
     QuestionOut,
     QuestionList,
@@ -85,14 +86,15 @@ PARTNER_QUESTIONS = [
         ],
     },
 ]
+_QUESTIONS_RESPONSE = StaticJSON(QuestionList, PARTNER_QUESTIONS, private=True)
 
 @router.get(
     "/questions",
     response_model=QuestionList,
     summary="파트너 설문 질문 조회"
 )
-async def get_questions(user=Depends(get_current_user)):
-    return PARTNER_QUESTIONS
+async def get_questions(request: Request, user=Depends(get_current_user)):
+    return _QUESTIONS_RESPONSE.response(request)
 
 @router.post(
     "",
@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from deps import get_current_user
 from core.database import get_session
-from crud import get_profile, upsert_basic, upsert_extra
+from crud import get_profile, save_profile
 from schemas import ProfileIn, UserProfileOut
 
 router = APIRouter(prefix="/users/me", tags=["profile"])
@@ -36,16 +36,8 @@ async def upsert_profile(
     user = Depends(get_current_user),
     db: AsyncSession = Depends(get_session),
 ):
-    await upsert_basic(db, user.id, data)
-
-    await upsert_extra(db, user.id, data)
-
-    profile = await get_profile(db, user.id)
-    if profile is None:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="프로필 저장 후 조회에 실패했습니다."
-        )
+    # 기본/추가 정보를 한 번에 저장하고 RETURNING 으로 받은 행을 그대로 응답
+    profile = await save_profile(db, user.id, data)
 
     return {
         "id": user.id,
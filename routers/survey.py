@@ -1,13 +1,15 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from deps import get_current_user
 from core.database import get_session
+from core.static_response import StaticJSON
 from crud import (
     upsert_answers,
     get_user_answers,
     get_group_input_answers,
-    upsert_group_input_answers
+    upsert_group_input_answers,
+    get_survey_answers
 )
 from schemas import (
     ChoiceAnswerList,
@@ -15,7 +17,9 @@ from schemas import (
     QuestionWithAnswerOut,
     GroupInputAnswerList,
     GroupInputOut,
-    SubQuestionOut
+    SubQuestionOut,
+    SurveySnapshotOut,
+    SurveyQuestionsOut
 )
 from models import (
     LifestyleAnswer,
@@ -25,37 +29,58 @@ from models import (
     IntroductionAnswer,
     GroupInputAnswer
 )
-from constants import QUESTION_DEFINITIONS
+from catalog import ESSAY_TEMPLATES, SECTION_TEMPLATES, fill_essay, fill_section
 
 
 router = APIRouter(prefix="/survey", tags=["survey"])
 
+# 스냅샷 섹션: 이름 -> 답변 모델. 질문 구성은 catalog.SECTION_TEMPLATES (개별 GET 엔드포인트와 같음)
+SNAPSHOT_SECTIONS = {
+    "lifestyle": LifestyleAnswer,
+    "identify": TraitAnswer,
+    "preference": PreferenceAnswer,
+    "beliefs": ValuesAnswer,
+}
+
+
 async def _load_and_merge(
     db: AsyncSession,
     user_id: int,
-    qmin: int,
-    qmax: int,
+    section: str,
     model_cls,
     is_text: bool = False
 ) -> List[QuestionWithAnswerOut]:
-    defs = [q for q in QUESTION_DEFINITIONS if qmin <= q["id"] <= qmax]
     stored = await get_user_answers(db, user_id, model_cls)
-    out = []
-    for q in defs:
-        vals = stored.get(q["id"], [])
-        out.append(QuestionWithAnswerOut(
-            **q,
-            answer_ids=vals or None,
-            text=vals[0] if is_text and vals else None
-        ))
-    return out
+    return fill_section(section, stored, is_text=is_text)
+
+
+_QUESTIONS_RESPONSE = StaticJSON(
+    SurveyQuestionsOut,
+    {**SECTION_TEMPLATES, "essay": ESSAY_TEMPLATES},
+    private=True
+)
+
+
+@router.get(
+    "/questions",
+    response_model=SurveyQuestionsOut,
+    summary="설문 질문 전체 (답변 제외)"
+)
+async def get_questions(request: Request, user=Depends(get_current_user)):
+    """
+    모든 섹션의 질문 정의를 /survey/snapshot 과 같은 구성으로 반환합니다. 배포 사이에 바뀌지 않으므로
+    ETag / Cache-Control 로 캐시하고, If-None-Match 가 맞으면 304 를 반환합니다.
+    """
+    return _QUESTIONS_RESPONSE.response(request)
+
+
 @router.get(
     "/lifestyle",
     response_model=List[QuestionWithAnswerOut],
     summary="라이프스타일 설문"
 )
 async def get_lifestyle(user=Depends(get_current_user), db: AsyncSession = Depends(get_session)):
-    return await _load_and_merge(db, user.id, 1, 7, LifestyleAnswer)
+    return await _load_and_merge(db, user.id, "lifestyle", LifestyleAnswer)
 
 
 @router.post(
@@ -74,7 +99,7 @@ async def post_lifestyle(payload: ChoiceAnswerList, user=Depends(get_current_use
     summary="성향파악 설문"
 )
 async def get_identify(user=Depends(get_current_user), db: AsyncSession = Depends(get_session)):
-    return await _load_and_merge(db, user.id, 8, 20, TraitAnswer)
+    return await _load_and_merge(db, user.id, "identify", TraitAnswer)
 
 
 @router.post(
@@ -93,7 +118,7 @@ async def post_identify(payload: ChoiceAnswerList, user=Depends(get_current_user
     summary="취향파악 설문"
 )
 async def get_preference(user=Depends(get_current_user), db: AsyncSession = Depends(get_session)):
-    return await _load_and_merge(db, user.id, 21, 27, PreferenceAnswer)
+    return await _load_and_merge(db, user.id, "preference", PreferenceAnswer)
 
 
 @router.post(
@@ -112,7 +137,7 @@ async def post_preference(payload: ChoiceAnswerList, user=Depends(get_current_us
     summary="가치관파악 설문"
 )
 async def get_beliefs(user=Depends(get_current_user), db: AsyncSession = Depends(get_session)):
-    return await _load_and_merge(db, user.id, 28, 33, ValuesAnswer)
+    return await _load_and_merge(db, user.id, "beliefs", ValuesAnswer)
 
 
 @router.post(
@@ -123,20 +148,16 @@ async def get_beliefs(user=Depends(get_current_user), db: AsyncSession = Depends
 async def post_beliefs(payload: ChoiceAnswerList, user=Depends(get_current_user), db: AsyncSession = Depends(get_session)):
     cnt = await upsert_answers(db, user.id, payload.answers, ValuesAnswer, is_text=False)
     return SaveResult(status="success", saved_count=cnt)
+
+
 @router.get(
     "/essay",
     response_model=GroupInputOut,
     summary="주관식 소개"
 )
 async def get_group_input(user=Depends(get_current_user), db: AsyncSession = Depends(get_session)):
-    q34 = next(q for q in QUESTION_DEFINITIONS if q["id"] == 34)
     stored = await get_group_input_answers(db, user.id)
-    return GroupInputOut(
-        answers=[
-            { **sub, "text": stored.get(sub["id"]) }
-            for sub in q34["subQuestions"]
-        ]
-    )
+    return fill_essay(stored)
 
 
 @router.post(
@@ -147,4 +168,39 @@ async def get_group_input(user=Depends(get_current_user), db: AsyncSession = Dep
 )
 async def post_group_input(payload: GroupInputAnswerList, user=Depends(get_current_user), db: AsyncSession = Depends(get_session)):
     cnt = await upsert_group_input_answers(db, user.id, payload.answers)
-    return SaveResult(status="success", saved_count=cnt)
\ No newline at end of file
+    return SaveResult(status="success", saved_count=cnt)
+
+
+@router.get(
+    "/snapshot",
+    response_model=SurveySnapshotOut,
+    summary="설문 전체 + 진행률"
+)
+async def get_snapshot(user=Depends(get_current_user), db: AsyncSession = Depends(get_session)):
+    """
+    lifestyle / identify / preference / beliefs / essay 를 한 번에 반환합니다.
+    답변은 쿼리 한 번(UNION ALL)으로 읽고, 미리 만들어 둔 카탈로그 템플릿에 채웁니다.
+    """
+    answers, essay = await get_survey_answers(db, user.id, SNAPSHOT_SECTIONS)
+    sections = {name: fill_section(name, answers[name]) for name in SNAPSHOT_SECTIONS}
+    progress = {
+        name: {"answered": sum(q.answer_ids is not None for q in questions), "total": len(questions)}
+        for name, questions in sections.items()
+    }
+    progress["essay"] = {
+        "answered": sum(bool(essay.get(t.id)) for t in ESSAY_TEMPLATES),
+        "total": len(ESSAY_TEMPLATES),
+    }
+
+    answered = sum(p["answered"] for p in progress.values())
+    total = sum(p["total"] for p in progress.values())
+    return SurveySnapshotOut(
+        **sections,
+        essay=fill_essay(essay),
+        progress={
+            "answered": answered,
+            "total": total,
+            "percent": round(answered * 100 / total, 1) if total else 0.0,
+            "sections": progress,
+        }
+    )
@@ -165,6 +165,36 @@ class GroupInputOut(BaseModel):
     question_id: Literal[34] = 34
     answers: List[SubQuestionOut]
     
+class SectionProgressOut(BaseModel):
+    answered: int
+    total: int
+
+
+class SurveyProgressOut(BaseModel):
+    answered: int
+    total: int
+    percent: float = Field(..., description="0~100")
+    sections: Dict[str, SectionProgressOut]
+
+
+class SurveySnapshotOut(BaseModel):
+    """설문 전체 섹션 + 진행률 (/survey/snapshot)"""
+    lifestyle: List[QuestionWithAnswerOut]
+    identify: List[QuestionWithAnswerOut]
+    preference: List[QuestionWithAnswerOut]
+    beliefs: List[QuestionWithAnswerOut]
+    essay: GroupInputOut
+    progress: SurveyProgressOut
+
+
+class SurveyQuestionsOut(BaseModel):
+    """설문 질문 정의만 (/survey/questions, 답변 제외)"""
+    lifestyle: List[QuestionOut]
+    identify: List[QuestionOut]
+    preference: List[QuestionOut]
+    beliefs: List[QuestionOut]
+    essay: List[SubQuestionDef]
+
 # --- 파트너 ---    
 class NewPartnerIn(BaseModel):
     answers: List[ChoiceAnswerIn]
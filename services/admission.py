@@ -0,0 +1,110 @@
+import asyncio
+import contextlib
+import logging
+from typing import Any, AsyncIterator, Dict
+
+from fastapi import WebSocket
+
+from core.config import settings
+from core.metrics import Counter, Gauge
+
+logger = logging.getLogger("rendi_api")
+
+# 1013 Try Again Later (RFC 6455 7.4.1 / IANA 등록 코드)
+CLOSE_TRY_AGAIN_LATER = 1013
+
+SPEECH_SESSIONS_REJECTED = Counter(
+    "speech_sessions_rejected_total",
+    "/ws/speech connections rejected because the worker was at SPEECH_MAX_SESSIONS",
+)
+
+
+class Admission:
+    """
+    워커(프로세스) 단위 실시간 세션 수용 제어.
+    - 동시 /ws/speech 세션 수: 상한을 넘는 연결은 1013 으로 거절
+    - 동시에 실행 중인 AI 파이프라인 수: 상한에 걸리면 세션 워커가 자리가 날 때까지 대기
+      (그동안 들어온 발화는 세션 큐에서 합쳐지거나 버려지므로 자연스럽게 부하가 줄어든다)
+    0 이면 제한 없음
+    """
+
+    def __init__(self, max_sessions: int, max_pipelines: int):
+        self.max_sessions = max_sessions
+        self.max_pipelines = max_pipelines
+        self.sessions = 0
+        self.pipelines = 0
+        self.pipelines_waiting = 0
+        self._pipeline_semaphore = asyncio.Semaphore(max_pipelines) if max_pipelines > 0 else None
+
+    def try_open_session(self) -> bool:
+        if self.max_sessions > 0 and self.sessions >= self.max_sessions:
+            return False
+        self.sessions += 1
+        return True
+
+    def close_session(self) -> None:
+        self.sessions -= 1
+
+    @contextlib.asynccontextmanager
+    async def pipeline_slot(self) -> AsyncIterator[None]:
+        if self._pipeline_semaphore is None:
+            self.pipelines += 1
+            try:
+                yield
+            finally:
+                self.pipelines -= 1
+            return
+        self.pipelines_waiting += 1
+        try:
+            await self._pipeline_semaphore.acquire()
+        finally:
+            self.pipelines_waiting -= 1
+        self.pipelines += 1
+        try:
+            yield
+        finally:
+            self.pipelines -= 1
+            self._pipeline_semaphore.release()
+
+    def saturated(self) -> bool:
+        sessions_full = self.max_sessions > 0 and self.sessions >= self.max_sessions
+        pipelines_full = self.max_pipelines > 0 and self.pipelines >= self.max_pipelines
+        return sessions_full or pipelines_full
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "ready": not self.saturated(),
+            "sessions": self.sessions,
+            "max_sessions": self.max_sessions,
+            "pipelines": self.pipelines,
+            "pipelines_waiting": self.pipelines_waiting,
+            "max_pipelines": self.max_pipelines,
+        }
+
+
+admission = Admission(settings.SPEECH_MAX_SESSIONS, settings.AI_MAX_INFLIGHT_PIPELINES)
+
+Gauge(
+    "speech_sessions_active",
+    "Open /ws/speech sessions on this worker",
+    collect=lambda: {(): admission.sessions},
+)
+Gauge(
+    "ai_pipelines_inflight",
+    "Speech AI pipelines running (running) or waiting for a slot (waiting)",
+    ("state",),
+    collect=lambda: {("running",): admission.pipelines, ("waiting",): admission.pipelines_waiting},
+)
+
+
+async def reject_busy(websocket: WebSocket) -> None:
+    """상한 초과 연결: accept 후 재시도 힌트를 보내고 1013 으로 닫는다"""
+    SPEECH_SESSIONS_REJECTED.inc()
+    retry_after = settings.SPEECH_RETRY_AFTER
+    logger.warning(
+        "Rejecting speech session: %d/%d sessions open", admission.sessions, admission.max_sessions
+    )
+    await websocket.accept()
+    with contextlib.suppress(RuntimeError):
+        await websocket.send_json({"type": "error", "error": "server busy", "retry_after": retry_after})
+        await websocket.close(code=CLOSE_TRY_AGAIN_LATER, reason=f"server busy; retry after {retry_after}s")
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("rendi_api")
+
+StageFn = Callable[[Dict[str, Any]], Awaitable[Any]]
+OnComplete = Callable[[str, Any], Awaitable[None]]
+
+
+@dataclass
+class Stage:
+    """
+    파이프라인의 한 단계.
+    - run(deps) 는 의존 단계들의 결과 dict 를 받아 이 단계의 결과를 반환
+    - timeout 을 넘기면 이 단계(와 이 단계에 의존하는 단계)만 버린다
+    - required 단계가 실패하면 전체 파이프라인이 실패
+    """
+    name: str
+    run: StageFn
+    deps: Tuple[str, ...] = ()
+    timeout: Optional[float] = None
+    required: bool = False
+
+
+class StageSkipped(Exception):
+    """의존 단계가 실패해서 실행하지 않은 단계"""
+
+
+@dataclass
+class DagResult:
+    results: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+def _toposort(stages: Iterable[Stage]) -> List[Stage]:
+    by_name = {s.name: s for s in stages}
+    ordered: List[Stage] = []
+    state: Dict[str, int] = {}  # 1 = 방문 중, 2 = 완료
+
+    def visit(name: str, path: Tuple[str, ...]):
+        if name not in by_name:
+            raise ValueError(f"unknown stage dependency: {name} (via {' -> '.join(path)})")
+        if state.get(name) == 2:
+            return
+        if state.get(name) == 1:
+            raise ValueError(f"stage dependency cycle: {' -> '.join(path + (name,))}")
+        state[name] = 1
+        for dep in by_name[name].deps:
+            visit(dep, path + (name,))
+        state[name] = 2
+        ordered.append(by_name[name])
+
+    for name in by_name:
+        visit(name, ())
+    return ordered
+
+
+async def run_dag(
+    stages: Iterable[Stage],
+    on_complete: Optional[OnComplete] = None
+) -> DagResult:
+    """
+    의존성이 만족되는 즉시 각 단계를 asyncio 태스크로 동시에 실행합니다.
+    선택 단계의 실패/타임아웃은 DagResult.errors 에 기록하고 계속 진행하며,
+    required 단계가 실패하면 나머지를 취소하고 예외를 그대로 올립니다.
+    """
+    ordered = _toposort(stages)
+    out = DagResult()
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def _run(stage: Stage):
+        deps: Dict[str, Any] = {}
+        for dep in stage.deps:
+            try:
+                deps[dep] = await tasks[dep]
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                raise StageSkipped(f"dependency '{dep}' failed")
+        result = await asyncio.wait_for(stage.run(deps), stage.timeout)
+        out.results[stage.name] = result
+        if on_complete is not None:
+            await on_complete(stage.name, result)
+        return result
+
+    for stage in ordered:
+        tasks[stage.name] = asyncio.create_task(_run(stage), name=f"stage:{stage.name}")
+    stage_of = {task: stage for stage, task in zip(ordered, tasks.values())}
+
+    pending = set(tasks.values())
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if stage_of[task].required and not task.cancelled() and task.exception():
+                    raise task.exception()
+    finally:
+        # required 실패 또는 바깥에서 취소된 경우: 남은 단계 정리
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    for stage in ordered:
+        task = tasks[stage.name]
+        exc = asyncio.CancelledError() if task.cancelled() else task.exception()
+        if exc is None:
+            continue
+        if isinstance(exc, asyncio.TimeoutError):
+            reason = f"timeout after {stage.timeout}s"
+        else:
+            reason = str(exc) or exc.__class__.__name__
+        if not isinstance(exc, StageSkipped):
+            logger.warning("AI stage '%s' dropped: %s", stage.name, reason)
+        out.errors[stage.name] = reason
+    return out
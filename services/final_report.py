@@ -0,0 +1,141 @@
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Set, Tuple
+
+from cachetools import TTLCache
+
+from core.config import settings
+from services.session_services import create_final_report
+
+logger = logging.getLogger("rendi_api")
+
+# (요청 사용자 id, 요청 바디) — 같은 대화라도 다른 사용자/다른 옵션의 보고서는 공유하지 않는다
+ReportKey = Tuple[Any, str]
+
+# conversation_id -> {ReportKey: 최종 보고서}. 새 메시지가 들어오면 대화 단위로 invalidate
+_cache: TTLCache = TTLCache(
+    maxsize=settings.FINAL_REPORT_CACHE_SIZE, ttl=settings.FINAL_REPORT_CACHE_TTL
+)
+
+
+@dataclass(eq=False)
+class _Generation:
+    conversation_id: str
+    key: ReportKey
+    task: Optional[asyncio.Task] = None
+    waiters: int = 0
+    # 생성 중에 새 메시지가 들어옴: 결과를 캐시하지 않는다 (생성이 끝날 때까지 유지되는 표시)
+    stale: bool = field(default=False)
+
+
+# 같은 (대화, 사용자, 요청 바디) 에 대한 동시 생성 요청은 하나로 합친다
+_inflight: Dict[Tuple[str, ReportKey], _Generation] = {}
+# 소켓이 닫힌 뒤 생성하는 보고서 태스크 (GC 방지용 참조)
+_background: Set[asyncio.Task] = set()
+
+
+def _report_key(owner_id, payload: Optional[Dict[str, Any]]) -> ReportKey:
+    return owner_id, json.dumps(payload or {}, sort_keys=True, default=str)
+
+
+def cached_final_report(owner_id, conversation_id, payload: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    reports = _cache.get(str(conversation_id))
+    return reports.get(_report_key(owner_id, payload)) if reports else None
+
+
+def invalidate_final_report(conversation_id) -> None:
+    """새 메시지 반영: 캐시를 비우고, 진행 중인 생성은 낡은 것으로 표시해서 이후 요청과 합치지 않는다"""
+    conv = str(conversation_id)
+    _cache.pop(conv, None)
+    for inflight_key, gen in list(_inflight.items()):
+        if gen.conversation_id == conv:
+            gen.stale = True
+            del _inflight[inflight_key]
+
+
+async def _generate(
+    gen: _Generation,
+    payload: Dict[str, Any],
+    cookies: Optional[Dict[str, str]]
+) -> str:
+    fin = await create_final_report(gen.conversation_id, payload, cookies=cookies)
+    report = fin.get("final_report", "")
+    # 생성 중에 새 메시지가 들어왔으면 이 보고서는 이미 낡았으므로 캐시하지 않는다
+    if not gen.stale:
+        reports = _cache.get(gen.conversation_id)
+        if reports is None:
+            reports = _cache[gen.conversation_id] = {}
+        reports[gen.key] = report
+    return report
+
+
+async def generate_final_report(
+    owner_id,
+    conversation_id,
+    payload: Optional[Dict[str, Any]] = None,
+    cookies: Optional[Dict[str, str]] = None
+) -> str:
+    """
+    캐시를 무시하고 새로 생성. 같은 사용자/같은 요청 바디로 진행 중인 생성이 있으면 그 결과를 공유.
+    기다리는 호출이 모두 취소되면 AI 서버 요청도 취소한다
+    """
+    conv = str(conversation_id)
+    key = _report_key(owner_id, payload)
+    gen = _inflight.get((conv, key))
+    if gen is None:
+        gen = _Generation(conv, key)
+        gen.task = asyncio.ensure_future(_generate(gen, payload or {}, cookies))
+        _inflight[(conv, key)] = gen
+
+        def done(_, gen=gen):
+            if _inflight.get((conv, key)) is gen:
+                del _inflight[(conv, key)]
+
+        gen.task.add_done_callback(done)
+
+    gen.waiters += 1
+    try:
+        return await asyncio.shield(gen.task)
+    finally:
+        gen.waiters -= 1
+        if gen.waiters == 0 and not gen.task.done():
+            # 마지막 호출자가 취소됨: httpx 요청까지 끊고 정리될 때까지 기다린다
+            gen.task.cancel()
+            await asyncio.wait([gen.task])
+
+
+async def get_final_report(
+    owner_id,
+    conversation_id,
+    payload: Optional[Dict[str, Any]] = None,
+    cookies: Optional[Dict[str, str]] = None
+) -> str:
+    """
+    같은 사용자가 같은 요청 바디로 만든 보고서가 캐시에 있으면 그대로, 없으면 생성 후 캐시.
+    다른 사용자의 요청은 캐시를 거치지 않고 AI 서버(쿠키로 권한 확인)로 간다
+    """
+    report = cached_final_report(owner_id, conversation_id, payload)
+    if report is not None:
+        return report
+    return await generate_final_report(owner_id, conversation_id, payload, cookies)
+
+
+def generate_in_background(owner_id, conversation_id, cookies: Optional[Dict[str, str]] = None) -> None:
+    """
+    세션 종료 후 보고서를 미리 만들어 캐시 (클라이언트가 나중에 REST 로 조회).
+    세션과 분리된 태스크가 기다리므로 소켓이 닫혀도 취소되지 않는다
+    """
+    if cached_final_report(owner_id, conversation_id) is not None:
+        return
+
+    async def run():
+        try:
+            await generate_final_report(owner_id, conversation_id, cookies=cookies)
+        except Exception as e:
+            logger.error("Final report generation failed (%s): %s", conversation_id, e)
+
+    task = asyncio.ensure_future(run())
+    _background.add(task)
+    task.add_done_callback(_background.discard)
@@ -1,105 +1,183 @@
-import httpx
+import asyncio
+import time
+from contextvars import ContextVar
 from typing import Any, Dict, Optional
+from urllib.parse import quote
 from uuid import UUID
 
-from core.config import settings
+import httpx
+
+from core.http_client import get_ai_client, cookie_headers
+from core.metrics import Counter, Histogram
+
+# 모든 호출은 앱 lifespan 이 관리하는 공유 클라이언트(keep-alive, HTTP/2)를 사용합니다.
+# cookies 는 요청 단위로 AI 서버에 그대로 전달됩니다.
+
+AI_REQUEST_SECONDS = Histogram(
+    "ai_request_duration_seconds",
+    "AI server call latency by pipeline stage and response status",
+    ("stage", "status_code"),
+)
+AI_REQUEST_ERRORS = Counter(
+    "ai_request_errors_total",
+    "AI server calls that failed (non-2xx, timeout, cancellation or transport error)",
+    ("stage", "status_code"),
+)
+
+# 호출을 소유한 세션 (SpeechSession.spawn 이 태스크 컨텍스트에 설정, .closed 속성을 가진 객체).
+# 소유 세션이 닫혀서 취소된 호출만 통계에서 빼고, 단계 타임아웃 등 나머지 취소는 "cancelled" 로 기록
+AI_CALL_OWNER: ContextVar[Optional[Any]] = ContextVar("ai_call_owner", default=None)
 
-BASE_URL = settings.AI_SERVER_URL.rstrip("/")
 
-async def create_conversation(conversation_id: str, payload: dict):
-    return (await client.post(f"{BASE_URL}/api/v1/conversation/{conversation_id}", json=payload)).json()
-'''
-async def create_conversation(payload: Dict[str, Any]) -> Dict[str, Any]:
+async def _request(
+    stage: str,
+    method: str,
+    url: str,
+    cookies: Optional[Dict[str, str]],
+    **kwargs
+) -> httpx.Response:
+    """공유 클라이언트로 요청하고 단계별 지연/오류를 기록"""
+    start = time.perf_counter()
+    status = "error"
+    try:
+        resp = await get_ai_client().request(method, url, headers=cookie_headers(cookies), **kwargs)
+        status = str(resp.status_code)
+        return resp
+    except httpx.TimeoutException:
+        status = "timeout"
+        raise
+    except asyncio.CancelledError:
+        owner = AI_CALL_OWNER.get()
+        # 세션 종료로 취소된 호출은 지연/오류 통계에서 제외
+        status = None if owner is not None and owner.closed else "cancelled"
+        raise
+    finally:
+        if status is not None:
+            AI_REQUEST_SECONDS.observe(time.perf_counter() - start, stage=stage, status_code=status)
+            if not status.startswith("2"):
+                AI_REQUEST_ERRORS.inc(stage=stage, status_code=status)
+
+
+async def create_conversation(
+    conversation_id: str,
+    payload: Dict[str, Any],
+    cookies: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
     """
     새 대화 세션을 생성합니다.
-    POST /api/v1/conversation
+    POST /api/v1/conversation/{conversation_id}
     """
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(f"{BASE_URL}/api/v1/conversation", json=payload)
-        resp.raise_for_status()
-        return resp.json()
-'''
+    resp = await _request(
+        "conversation_create", "POST", f"/api/v1/conversation/{conversation_id}", cookies,
+        json=payload
+    )
+    resp.raise_for_status()
+    return resp.json()
+
 
-async def add_message(conversation_id: UUID, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+async def add_message(
+    conversation_id: UUID,
+    payload: Dict[str, Any],
+    cookies: Optional[Dict[str, str]] = None
+) -> Optional[Dict[str, Any]]:
     """
     대화에 메시지를 추가하고, AI의 전체 응답(Envelope)을 반환합니다.
     POST /api/v1/conversation/{conversation_id}/messages
     """
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"{BASE_URL}/api/v1/conversation/{conversation_id}/messages",
-            json=payload
-        )
-        if resp.status_code == 404:
-            return None
-        resp.raise_for_status()
-        return resp.json()
-
-
-async def get_realtime_memory(conversation_id: UUID, payload: Dict[str, Any]) -> Dict[str, Any]:
+    resp = await _request(
+        "messages", "POST", f"/api/v1/conversation/{conversation_id}/messages", cookies,
+        json=payload
+    )
+    if resp.status_code == 404:
+        return None
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def get_realtime_memory(
+    conversation_id: UUID,
+    payload: Dict[str, Any],
+    cookies: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
     """
     실시간 메모리를 생성/조회합니다.
     POST /api/v1/conversation/{conversation_id}/realtime-memory
     """
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"{BASE_URL}/api/v1/conversation/{conversation_id}/realtime-memory",
-            json=payload
-        )
-        resp.raise_for_status()
-        # 스펙에 따르면 키가 partner_memory
-        return resp.json().get("partner_memory", {})
+    resp = await _request(
+        "realtime_memory", "POST", f"/api/v1/conversation/{conversation_id}/realtime-memory", cookies,
+        json=payload
+    )
+    resp.raise_for_status()
+    # 스펙에 따르면 키가 partner_memory
+    return resp.json().get("partner_memory", {})
 
 
-async def get_realtime_analysis(conversation_id: UUID) -> Dict[str, Any]:
+async def get_realtime_analysis(
+    conversation_id: UUID,
+    cookies: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
     """
     실시간 분석 결과를 조회합니다.
     GET /api/v1/conversation/{conversation_id}/realtime-analysis
     """
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(f"{BASE_URL}/api/v1/conversation/{conversation_id}/realtime-analysis")
-        resp.raise_for_status()
-        # 스펙에 따르면 키가 scores
-        return resp.json().get("scores", {})
+    resp = await _request(
+        "realtime_analysis", "GET", f"/api/v1/conversation/{conversation_id}/realtime-analysis", cookies
+    )
+    resp.raise_for_status()
+    # 스펙에 따르면 키가 scores
+    return resp.json().get("scores", {})
 
 
-async def get_breaktime_recommendation(conversation_id: UUID, payload: Dict[str, Any]) -> Any:
+async def get_breaktime_recommendation(
+    conversation_id: UUID,
+    payload: Optional[Dict[str, Any]] = None,
+    cookies: Optional[Dict[str, str]] = None
+) -> Any:
     """
     휴식 타임 추천을 생성합니다.
     POST /api/v1/conversation/{conversation_id}/breaktime-advice/recommendation
     """
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"{BASE_URL}/api/v1/conversation/{conversation_id}/breaktime-advice/recommendation",
-            json=payload
-        )
-        resp.raise_for_status()
-        # 스펙에 따르면 키가 advice_metadatas
-        return resp.json().get("advice_metadatas", [])
+    resp = await _request(
+        "recommendation", "POST", f"/api/v1/conversation/{conversation_id}/breaktime-advice/recommendation", cookies,
+        json=payload
+    )
+    resp.raise_for_status()
+    # 스펙에 따르면 키가 advice_metadatas
+    return resp.json().get("advice_metadatas", [])
 
 
-async def get_breaktime_advice_detail(conversation_id: UUID, advice_id: str) -> Dict[str, Any]:
+async def get_breaktime_advice_detail(
+    conversation_id: UUID,
+    advice_id: str,
+    cookies: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
     """
     추천된 조언의 상세 내용을 조회합니다.
     POST /api/v1/conversation/{conversation_id}/breaktime-advice/{advice_id}
     """
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"{BASE_URL}/api/v1/conversation/{conversation_id}/breaktime-advice/{advice_id}"
-        )
-        resp.raise_for_status()
-        return resp.json()
+    # advice_id 는 경로 한 구간으로만 쓰이도록 인코딩 ("." / ".." 는 httpx 가 상위 경로로 해석하므로 거절)
+    if advice_id in ("", ".", ".."):
+        raise ValueError(f"invalid advice_id: {advice_id!r}")
+    segment = quote(advice_id, safe="")
+    resp = await _request(
+        "advice_detail", "POST", f"/api/v1/conversation/{conversation_id}/breaktime-advice/{segment}", cookies
+    )
+    resp.raise_for_status()
+    return resp.json()
 
 
-async def create_final_report(conversation_id: UUID, payload: Dict[str, Any]) -> Dict[str, Any]:
+async def create_final_report(
+    conversation_id: UUID,
+    payload: Dict[str, Any],
+    cookies: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
     """
     최종 보고서를 생성합니다.
     POST /api/v1/conversation/{conversation_id}/final-report
     """
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"{BASE_URL}/api/v1/conversation/{conversation_id}/final-report",
-            json=payload
-        )
-        resp.raise_for_status()
-        return resp.json()
+    resp = await _request(
+        "final_report", "POST", f"/api/v1/conversation/{conversation_id}/final-report", cookies,
+        json=payload
+    )
+    resp.raise_for_status()
+    return resp.json()
@@ -0,0 +1,311 @@
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from core.config import settings
+from services.admission import admission
+from services.dag import Stage, run_dag
+from services.speech_session import SpeechSession, Utterance, concurrency_limit, safe_send, send_frame
+from services.session_services import (
+    add_message,
+    get_realtime_memory,
+    get_realtime_analysis,
+    get_breaktime_recommendation,
+    get_breaktime_advice_detail,
+)
+from services.final_report import (
+    generate_final_report,
+    get_final_report,
+    invalidate_final_report,
+)
+
+logger = logging.getLogger("rendi_api")
+
+
+# 워커 전체에서 동시에 진행 중인 조언 상세 요청 수 제한
+_advice_global_semaphore = concurrency_limit(settings.AI_ADVICE_DETAIL_GLOBAL_CONCURRENCY)
+
+
+def stage_timeout(name: str) -> float:
+    return settings.AI_STAGE_TIMEOUTS.get(name, settings.AI_STAGE_TIMEOUT)
+
+
+# 스트리밍 모드에서 단계 이름 -> 프레임 type
+STAGE_FRAME_TYPES = {
+    "message": "message",
+    "partner_memory": "partner_memory",
+    "analysis": "analysis",
+    "advice_metadatas": "advice",
+    "final_report": "final_report",
+}
+
+OnAdviceDetail = Callable[[int, str, Dict[str, Any]], Awaitable[None]]
+
+
+async def _gather_or_cancel(aws: Iterable[Awaitable[Any]]) -> List[Any]:
+    """gather 와 같지만 하나라도 실패하면 나머지를 취소"""
+    tasks = [asyncio.ensure_future(a) for a in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def _get_advice_detail(session: SpeechSession, advice_id: str) -> Dict[str, Any]:
+    async with _advice_global_semaphore:
+        return await get_breaktime_advice_detail(
+            session.conversation_id, advice_id, cookies=session.cookies
+        )
+
+
+async def fetch_advice_detail(session: SpeechSession, advice_id: str) -> Dict[str, Any]:
+    async with session.advice_semaphore:
+        return await _get_advice_detail(session, advice_id)
+
+
+async def fetch_advice_details(
+    session: SpeechSession,
+    advice_ids: List[str],
+    on_item: Optional[OnAdviceDetail] = None
+) -> List[Dict[str, Any]]:
+    """
+    조언 상세를 동시에 조회하고 추천 순서대로 돌려준다.
+    on_item 이 있으면 도착하는 순서대로 (index, advice_id, detail) 로 호출
+    """
+    async def one(index: int, aid: str):
+        detail = await fetch_advice_detail(session, aid)
+        if on_item is not None:
+            await on_item(index, aid, detail)
+        return detail
+
+    return await _gather_or_cancel(one(i, aid) for i, aid in enumerate(advice_ids))
+
+
+def build_utterance_stages(
+    session: SpeechSession,
+    batch: List[Utterance],
+    on_advice_detail: Optional[OnAdviceDetail] = None
+) -> List[Stage]:
+    """
+    발화 묶음(보통 1건)에 대한 AI 호출 그래프.
+    message 단계에서 묶음의 메시지를 순서대로 모두 보내고, 이후 단계는 한 번만 실행.
+
+        message ─┬─ partner_memory
+                 ├─ analysis
+                 ├─ advice_metadatas ── advice_details
+                 └─ final_report   (FINAL_REPORT_MODE 에 따라 생략)
+    """
+    cookies = session.cookies
+
+    async def message(_):
+        conv_id = await session.ensure_conversation()
+        for utt in batch:
+            msg = await add_message(conv_id, utt.payload, cookies=cookies)
+            if msg is None:
+                raise RuntimeError(f"Conversation not found: {conv_id}")
+            session.messages_posted += 1
+        # 대화가 바뀌었으므로 캐시된 보고서는 더 이상 최신이 아님
+        invalidate_final_report(conv_id)
+        return msg
+
+    async def partner_memory(_):
+        return await get_realtime_memory(session.conversation_id, {}, cookies=cookies)
+
+    async def analysis(_):
+        return await get_realtime_analysis(session.conversation_id, cookies=cookies)
+
+    async def advice_metadatas(_):
+        return await get_breaktime_recommendation(session.conversation_id, cookies=cookies)
+
+    async def advice_details(deps):
+        ids = [advice.get("advice_id") for advice in deps["advice_metadatas"]]
+        top_n = settings.AI_ADVICE_DETAIL_INLINE_TOP_N
+        inline, deferred = (ids[:top_n], ids[top_n:]) if top_n > 0 else (ids, [])
+        session.advice_pending.update(str(aid) for aid in deferred if aid is not None)
+        return {
+            "advice_details": await fetch_advice_details(session, inline, on_advice_detail),
+            # 나머지는 클라이언트가 {"type": "advice_detail", "advice_id": ...} 로 요청
+            "advice_details_pending": deferred,
+        }
+
+    async def final_report(_):
+        session.last_report_at = session.loop.time()
+        return await generate_final_report(session.user.id, session.conversation_id, cookies=cookies)
+
+    stages = [
+        Stage("message", message, timeout=stage_timeout("message"), required=True),
+        Stage("partner_memory", partner_memory, ("message",), stage_timeout("partner_memory")),
+        Stage("analysis", analysis, ("message",), stage_timeout("analysis")),
+        Stage("advice_metadatas", advice_metadatas, ("message",), stage_timeout("advice_metadatas")),
+        Stage("advice_details", advice_details, ("advice_metadatas",), stage_timeout("advice_details")),
+    ]
+    mode = settings.FINAL_REPORT_MODE
+    if mode == "per_utterance" or (mode == "rolling" and session.report_due()):
+        stages.append(
+            Stage("final_report", final_report, ("message",), stage_timeout("final_report"))
+        )
+    return stages
+
+
+async def handle_ai_pipeline(
+    session: SpeechSession,
+    batch: List[Utterance]
+):
+    """세션 워커가 호출: 합쳐진 발화 묶음 하나를 처리해서 결과 전송"""
+    ws = session.ws
+    if session.stream:
+        await stream_ai_pipeline(session, batch)
+        return
+    envelope: Dict[str, Any] = {}
+    try:
+        dag = await run_dag(build_utterance_stages(session, batch))
+    except Exception as e:
+        logger.error("AI pipeline error: %s", e)
+        await safe_send(ws, {"error": str(e)})
+        return
+
+    envelope.update(dag.results.pop("message"))
+    details = dag.results.pop("advice_details", None)
+    envelope.update(dag.results)
+    if details is not None:
+        envelope["advice_details"] = details["advice_details"]
+        if details["advice_details_pending"]:
+            envelope["advice_details_pending"] = details["advice_details_pending"]
+    if dag.errors:
+        # 시간 초과/실패로 빠진 단계는 나머지 결과와 함께 알려준다
+        envelope["stage_errors"] = dag.errors
+    envelope['message'] = batch[-1].payload['message']
+    await safe_send(ws, envelope)
+
+
+async def stream_ai_pipeline(
+    session: SpeechSession,
+    batch: List[Utterance]
+):
+    """
+    스트리밍 모드: 한 번에 envelope 를 보내는 대신 단계가 끝날 때마다 프레임 전송.
+    (transcript 는 수신 즉시 세션에서 전송) → message / partner_memory / analysis /
+    advice / advice_detail / final_report → done
+    프레임에는 묶음 마지막 발화의 utterance_id 가 붙고, 합쳐진 나머지는 done.coalesced 로 알린다.
+    """
+    ws = session.ws
+    utterance_id = batch[-1].utterance_id
+
+    async def on_complete(stage: str, result: Any):
+        frame_type = STAGE_FRAME_TYPES.get(stage)
+        if frame_type:
+            await send_frame(ws, frame_type, utterance_id, result)
+
+    async def on_advice_detail(index: int, advice_id: str, detail: Dict[str, Any]):
+        await send_frame(ws, "advice_detail", utterance_id, detail, advice_id=advice_id, index=index)
+
+    try:
+        dag = await run_dag(build_utterance_stages(session, batch, on_advice_detail), on_complete)
+    except Exception as e:
+        logger.error("AI pipeline error: %s", e)
+        await send_frame(ws, "error", utterance_id, error=str(e))
+        return
+
+    done: Dict[str, Any] = {}
+    coalesced = [i for utt in batch for i in utt.coalesced_ids + [utt.utterance_id]][:-1]
+    if coalesced:
+        done["coalesced"] = coalesced
+    details = dag.results.get("advice_details")
+    if details and details["advice_details_pending"]:
+        done["advice_details_pending"] = details["advice_details_pending"]
+    if dag.errors:
+        done["stage_errors"] = dag.errors
+    await send_frame(ws, "done", utterance_id, **done)
+
+
+async def send_advice_detail(session: SpeechSession, advice_id: str, utterance_id: Optional[str] = None):
+    """지연 조회 요청된 조언 상세 1건을 가져와 전송"""
+    try:
+        # 발화 파이프라인 밖의 AI 호출이므로 같은 워커 상한(AI_MAX_INFLIGHT_PIPELINES)을 따로 잡는다.
+        # session.advice_semaphore 는 잡지 않는다: 자리를 쥔 발화 파이프라인의 인라인 조회가 기다리는 락이라
+        # 그걸 쥔 채 자리를 기다리면 교착된다
+        async with admission.pipeline_slot():
+            detail = await _get_advice_detail(session, advice_id)
+    except Exception as e:
+        logger.error("Advice detail error (%s): %s", advice_id, e)
+        await send_frame(session.ws, "advice_detail", utterance_id, advice_id=advice_id, error=str(e))
+        return
+    finally:
+        session.advice_inflight.discard(advice_id)
+    # 전달한 조언은 더 이상 지연 조회 대상이 아님 (실패하면 남겨 두어 다시 요청 가능)
+    session.advice_pending.discard(advice_id)
+    await send_frame(session.ws, "advice_detail", utterance_id, detail, advice_id=advice_id)
+
+
+async def end_session(session: SpeechSession):
+    """
+    "end" 제어 프레임: 남은 발화 처리를 기다린 뒤 최종 보고서를 생성(캐시)해서 전송
+    """
+    session.ended = True
+    timeout = stage_timeout("final_report")
+    try:
+        await asyncio.wait_for(session.queue.join(), timeout)
+    except asyncio.TimeoutError:
+        logger.warning("Pending utterances not finished before end: %s", session.conversation_id)
+    async def final_report() -> str:
+        conv_id = await session.ensure_conversation()
+        # 워커 AI 파이프라인 상한 적용 (자리를 기다리는 시간도 timeout 에 포함)
+        async with admission.pipeline_slot():
+            return await get_final_report(session.user.id, conv_id, cookies=session.cookies)
+
+    try:
+        report = await asyncio.wait_for(final_report(), timeout)
+    except Exception as e:
+        logger.error("Final report error: %s", e)
+        await send_frame(session.ws, "error", None, error=str(e))
+        return
+    await send_frame(session.ws, "final_report", None, report, final=True)
+
+
+async def handle_control_frame(session: SpeechSession, text: str) -> bool:
+    """
+    /ws/speech 텍스트 프레임(JSON) 처리. True 를 반환하면 세션 종료.
+    - {"type": "advice_detail", "advice_id": "...", "utterance_id"?: "..."}: 응답에 빠진 조언 상세 지연 조회
+    - {"type": "end"}: 세션 종료, 최종 보고서 전송 후 소켓을 닫음
+    """
+    try:
+        frame = json.loads(text)
+    except ValueError:
+        await safe_send(session.ws, {"error": "invalid control frame"})
+        return False
+    kind = frame.get("type") if isinstance(frame, dict) else None
+    if kind == "end":
+        await end_session(session)
+        return True
+    if kind == "advice_detail" and frame.get("advice_id"):
+        advice_id = str(frame["advice_id"])
+        if advice_id not in session.advice_pending:
+            # 이 세션에 지연 조회로 알려준 id 만 AI 서버 경로에 넣는다
+            await send_frame(
+                session.ws, "advice_detail", frame.get("utterance_id"),
+                advice_id=advice_id, error="unknown advice_id"
+            )
+            return False
+        if advice_id in session.advice_inflight:
+            # 같은 id 의 조회가 이미 진행 중이면 그 결과 프레임으로 충분
+            return False
+        limit = settings.AI_ADVICE_DETAIL_CONCURRENCY
+        if limit > 0 and len(session.advice_inflight) >= limit:
+            # 세션당 진행 중인 지연 조회 수 제한 (기다리게 하지 않고 거절, 클라이언트가 다시 요청)
+            await send_frame(
+                session.ws, "advice_detail", frame.get("utterance_id"),
+                advice_id=advice_id, error="too many advice_detail requests"
+            )
+            return False
+        session.advice_inflight.add(advice_id)
+        session.spawn(
+            send_advice_detail(session, advice_id, frame.get("utterance_id")),
+            "advice_detail"
+        )
+    else:
+        await safe_send(session.ws, {"error": f"unknown control frame: {kind}"})
+    return False
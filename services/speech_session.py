@@ -0,0 +1,241 @@
+import asyncio
+import contextlib
+import logging
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Coroutine, List, Optional, Set
+
+from fastapi import WebSocket
+
+from core.config import settings
+from core.metrics import Counter
+from services.admission import admission
+from services.session_services import AI_CALL_OWNER, create_conversation
+
+logger = logging.getLogger("rendi_api")
+
+SPEECH_TASKS_REAPED = Counter(
+    "speech_tasks_reaped_total",
+    "In-flight tasks cancelled because the speech WebSocket closed",
+    ("kind",),
+)
+SPEECH_UTTERANCES_DROPPED = Counter(
+    "speech_utterances_dropped_total",
+    "Utterances dropped because the per-session queue was full",
+)
+
+
+def concurrency_limit(n: int):
+    """동시 실행 상한 n 의 async 컨텍스트 매니저 (0 이면 제한 없음)"""
+    return asyncio.Semaphore(n) if n > 0 else contextlib.nullcontext()
+
+
+async def safe_send(ws: WebSocket, data: dict):
+    try:
+        await ws.send_json(data)
+    except RuntimeError:
+        # 이미 close된 상태라면 무시
+        logging.info("WebSocket already closed; cannot send message.")
+
+
+async def send_frame(ws: WebSocket, frame_type: str, utterance_id: Optional[str], data: Any = None, **extra):
+    """스트리밍 모드 부분 결과 프레임: {type, utterance_id, data, ...}"""
+    frame = {"type": frame_type, "utterance_id": utterance_id}
+    if data is not None:
+        frame["data"] = data
+    frame.update(extra)
+    await safe_send(ws, frame)
+
+
+@dataclass
+class Utterance:
+    """STT 최종 결과 1건. payload 는 AI 서버 messages 바디 ({"message": {...}})"""
+    utterance_id: str
+    payload: dict
+    # 이 발화에 합쳐진 이전 발화들의 id
+    coalesced_ids: List[str] = field(default_factory=list)
+
+
+def coalesce(batch: List[Utterance]) -> List[Utterance]:
+    """연속된 같은 화자의 발화를 하나의 메시지로 합친다"""
+    merged: List[Utterance] = []
+    for utt in batch:
+        prev = merged[-1] if merged else None
+        if prev is None or prev.payload["message"]["role"] != utt.payload["message"]["role"]:
+            merged.append(utt)
+            continue
+        msg = dict(utt.payload["message"])
+        msg["content"] = f"{prev.payload['message']['content']} {msg['content']}"
+        merged[-1] = Utterance(
+            utt.utterance_id,
+            {**utt.payload, "message": msg},
+            prev.coalesced_ids + [prev.utterance_id] + utt.coalesced_ids,
+        )
+    return merged
+
+
+PipelineHandler = Callable[["SpeechSession", List[Utterance]], Awaitable[None]]
+
+
+class SpeechSession:
+    """
+    /ws/speech 연결 하나에 대응하는 세션.
+    - 연결 시점에 AI 서버 대화(conversation)를 한 번만 생성하고
+    - 이후 모든 발화(messages, realtime-memory, analysis, advice ...)에서 같은 conv_id 를 재사용
+    - STT 결과는 세션별 bounded 큐로 받아서 워커 하나가 순서대로 처리
+      (처리 중에 쌓인 발화는 다음 AI 호출 한 번으로 합침)
+    - 세션이 만든 태스크는 모두 spawn() 으로 추적하고, 소켓이 닫히면 close() 에서 취소
+    """
+
+    def __init__(self, websocket: WebSocket, user, cookies: dict, stream: bool = False):
+        self.ws = websocket
+        self.user = user
+        self.cookies = dict(cookies or {})
+        # True 면 단계별 부분 결과 프레임을 보냄 (/ws/speech?stream=1)
+        self.stream = stream
+        self.conversation_id = str(uuid.uuid4())
+        self.closed = False
+        self._init_task: Optional[asyncio.Task] = None
+        # 발화 파이프라인의 조언 상세(인라인) 동시 요청 수 제한.
+        # 파이프라인 자리(pipeline_slot)를 잡은 쪽만 쓰므로, 이걸 쥔 채 자리를 기다리는 경로를 만들지 말 것
+        self.advice_semaphore = concurrency_limit(settings.AI_ADVICE_DETAIL_CONCURRENCY)
+        # 지연 조회를 허용할 조언 id (advice_details_pending 으로 클라이언트에 알린 것만)
+        self.advice_pending: Set[str] = set()
+        # 진행 중인 지연 조회 id (같은 id 의 중복 요청은 무시, 개수는 AI_ADVICE_DETAIL_CONCURRENCY 로 제한)
+        self.advice_inflight: Set[str] = set()
+
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[Utterance] = asyncio.Queue(maxsize=settings.SPEECH_QUEUE_MAXSIZE)
+        self.dropped = 0
+        self._worker_task: Optional[asyncio.Task] = None
+        self._worker_busy = False
+        self._tasks: Set[asyncio.Task] = set()
+
+        # 최종 보고서 지연 생성용 상태
+        self.messages_posted = 0
+        self.last_report_at: Optional[float] = None
+        self.ended = False
+
+    def spawn(self, coro: Coroutine, kind: str) -> asyncio.Task:
+        """
+        세션 소유 태스크 생성. close() 시 아직 진행 중이면 취소된다.
+        태스크(와 그 하위 태스크)의 AI 호출은 이 세션을 소유자로 기록
+        """
+        async def owned():
+            # 태스크 컨텍스트 안에서 설정: 하위 태스크(wait_for 등)는 생성 시 컨텍스트를 복사해 물려받음
+            AI_CALL_OWNER.set(self)
+            return await coro
+
+        task = asyncio.create_task(owned(), name=f"speech:{kind}")
+        # 시작 전에 취소되면 coro 가 한 번도 await 되지 않으므로 닫아 준다 (끝난 코루틴이면 no-op)
+        task.add_done_callback(lambda _: coro.close())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def start(self) -> None:
+        """대화 생성을 백그라운드로 시작 (STT 시작과 병행)"""
+        self._init_task = self.spawn(self._create_conversation(), "conversation")
+
+    def start_worker(self, handler: PipelineHandler) -> None:
+        """큐를 비우는 세션 워커 시작 (세션당 AI 파이프라인은 항상 최대 1개)"""
+        self._worker_task = self.spawn(self._drain(handler), "pipeline")
+
+    def submit_threadsafe(self, payload: dict) -> None:
+        """STT SDK 스레드에서 호출: 이벤트 루프 스레드로 넘겨서 큐에 넣는다"""
+        with contextlib.suppress(RuntimeError):  # 루프가 이미 종료됨
+            self.loop.call_soon_threadsafe(self._enqueue, payload)
+
+    def _enqueue(self, payload: dict) -> None:
+        if self.closed:
+            return
+        utt = Utterance(uuid.uuid4().hex, payload)
+        if self.stream:
+            # 전사 결과는 큐/AI 호출을 기다리지 않고 바로 보낸다
+            self.spawn(send_frame(self.ws, "transcript", utt.utterance_id, payload["message"]), "send")
+        if self.queue.full():
+            if settings.SPEECH_QUEUE_OVERFLOW == "drop_newest":
+                self._drop(utt)
+                return
+            self._drop(self.queue.get_nowait())
+            self.queue.task_done()
+        self.queue.put_nowait(utt)
+
+    def _drop(self, utt: Utterance) -> None:
+        self.dropped += 1
+        SPEECH_UTTERANCES_DROPPED.inc()
+        logger.warning(
+            "Speech queue full; dropped utterance %s (session=%s, dropped=%d)",
+            utt.utterance_id, self.conversation_id, self.dropped
+        )
+        if self.stream:
+            self.spawn(send_frame(self.ws, "dropped", utt.utterance_id), "send")
+
+    async def _drain(self, handler: PipelineHandler) -> None:
+        while True:
+            batch = [await self.queue.get()]
+            while not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            try:
+                # 워커 전체 AI 파이프라인 상한: 기다리는 동안 새 발화는 큐에 쌓였다가 다음 묶음으로
+                async with admission.pipeline_slot():
+                    while not self.queue.empty():
+                        batch.append(self.queue.get_nowait())
+                    self._worker_busy = True
+                    await handler(self, coalesce(batch))
+            except Exception:
+                logger.exception("Speech pipeline worker error (session=%s)", self.conversation_id)
+            finally:
+                self._worker_busy = False
+                for _ in batch:
+                    self.queue.task_done()
+
+    def report_due(self) -> bool:
+        """rolling 모드: 마지막 보고서 갱신 후 FINAL_REPORT_ROLLING_INTERVAL 이 지났는지"""
+        if self.last_report_at is None:
+            return True
+        return self.loop.time() - self.last_report_at >= settings.FINAL_REPORT_ROLLING_INTERVAL
+
+    async def _create_conversation(self) -> str:
+        await create_conversation(self.conversation_id, {}, cookies=self.cookies)
+        logger.info("AI conversation created: %s (user=%s)", self.conversation_id, self.user.id)
+        return self.conversation_id
+
+    async def ensure_conversation(self) -> str:
+        """
+        생성된 conv_id 를 반환.
+        최초 생성이 실패했다면 다음 발화에서 다시 시도합니다.
+        """
+        if self.closed:
+            raise RuntimeError("speech session already closed")
+        if self._init_task is None:
+            self.start()
+        task = self._init_task
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # 동시에 여러 발화가 실패를 보더라도 재생성은 한 번만
+            if self._init_task is task:
+                self._init_task = self.spawn(self._create_conversation(), "conversation")
+            return await asyncio.shield(self._init_task)
+
+    async def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        # 진행 중인 AI 호출(httpx 요청 포함)까지 취소. 대기 중인 워커는 낭비가 아니므로 집계 제외
+        pending = [t for t in self._tasks if not t.done()]
+        reaped = [
+            t for t in pending
+            if t is not self._worker_task or self._worker_busy
+        ]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for task in reaped:
+            SPEECH_TASKS_REAPED.inc(kind=task.get_name().split(":", 1)[1])
+        logger.info(
+            "Speech session closed: %s (reaped %d tasks)", self.conversation_id, len(reaped)
+        )
@@ -0,0 +1,17 @@
+from core.config import settings
+from services.stt.base import SttBackend, SttResult, SttStreamError, ResultCallback
+
+
+def create_stt_backend(on_result: ResultCallback) -> SttBackend:
+    """settings.STT_BACKEND 에 맞는 백엔드 생성 (SDK 는 선택된 것만 import)"""
+    if settings.STT_BACKEND == "nest":
+        from services.stt.nest_backend import NestSttBackend
+        return NestSttBackend(on_result)
+    if settings.STT_BACKEND == "replay":
+        from services.stt.replay_backend import ReplaySttBackend
+        return ReplaySttBackend(on_result)
+    from services.stt.azure_backend import AzureSttBackend
+    return AzureSttBackend(on_result)
+
+
+__all__ = ["SttBackend", "SttResult", "SttStreamError", "ResultCallback", "create_stt_backend"]
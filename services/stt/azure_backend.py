@@ -0,0 +1,60 @@
+import time
+from functools import lru_cache
+
+import azure.cognitiveservices.speech as speechsdk
+from azure.cognitiveservices.speech import PropertyId
+from azure.cognitiveservices.speech.audio import PushAudioInputStream, AudioConfig
+from azure.cognitiveservices.speech.transcription import ConversationTranscriber
+
+from core.config import settings
+from services.stt.base import SttBackend, SttResult, is_self_speaker
+
+
+@lru_cache(maxsize=1)
+def get_speech_config() -> speechsdk.SpeechConfig:
+    speech_config = speechsdk.SpeechConfig(
+        subscription=settings.AZURE_SPEECH_KEY,
+        region=settings.AZURE_SPEECH_REGION
+    )
+    speech_config.speech_recognition_language = "ko-KR"
+    speech_config.set_property(
+        PropertyId.SpeechServiceResponse_DiarizeIntermediateResults, "true"
+    )
+    speech_config.set_service_property(
+        "Speech_SegmentationSilenceTimeoutMs", "500",
+        speechsdk.ServicePropertyChannel.UriQueryParameter
+    )
+    return speech_config
+
+
+class AzureSttBackend(SttBackend):
+    """Azure ConversationTranscriber (화자 분리). 결과 콜백은 SDK 스레드에서 호출됨"""
+    name = "azure"
+
+    async def start(self) -> None:
+        self._push_stream = PushAudioInputStream()
+        audio_input = AudioConfig(stream=self._push_stream)
+        self._transcriber = ConversationTranscriber(get_speech_config(), audio_input)
+        self._transcriber.transcribed.connect(self._on_transcribed)
+        self._started_at = time.monotonic()
+        self._transcriber.start_transcribing_async()
+
+    def _on_transcribed(self, evt):
+        # only final recognized speech
+        if evt.result.reason != speechsdk.ResultReason.RecognizedSpeech:
+            return
+        # offset/duration 은 100ns 단위
+        end_ticks = evt.result.offset + evt.result.duration
+        self._emit(SttResult(
+            text=evt.result.text,
+            speaker_id=evt.result.speaker_id,
+            is_self=is_self_speaker(evt.result.speaker_id),
+            audio_end_ms=end_ticks / 10_000,
+        ))
+
+    async def _write(self, chunk: bytes) -> None:
+        self._push_stream.write(chunk)
+
+    async def stop(self) -> None:
+        self._push_stream.close()
+        self._transcriber.stop_transcribing_async()
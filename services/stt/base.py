@@ -0,0 +1,125 @@
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Optional, Tuple
+
+from core.config import settings
+from core.metrics import Histogram
+
+logger = logging.getLogger("rendi_api")
+
+STT_FINALIZATION_SECONDS = Histogram(
+    "stt_finalization_seconds",
+    "Time from writing the last audio byte of an utterance to its final STT result",
+    ("backend",),
+)
+
+
+@dataclass
+class SttResult:
+    """최종 인식 결과 1건 (백엔드 공통)"""
+    text: str
+    speaker_id: Optional[str] = None
+    # 사용자 본인("나")의 발화인지. 화자 id 체계가 백엔드마다 달라서 백엔드에서 정규화한다
+    is_self: bool = True
+    # 스트림 시작 기준 발화가 끝난 오디오 위치(ms). 모르면 None
+    audio_end_ms: Optional[float] = None
+
+
+class AudioClock:
+    """
+    스트림에 써 넣은 오디오 위치(ms)와 그 위치를 쓴 시각(monotonic)의 대응.
+    결과의 audio_end_ms 로 "발화 마지막 오디오를 보낸 시각"을 찾는 데 사용
+    """
+
+    def __init__(self, sample_rate: int, maxlen: int = 4096):
+        self._bytes_per_ms = sample_rate * 2 / 1000  # PCM16 mono
+        self._bytes = 0
+        # 20ms 프레임 기준 약 80초 분량
+        self._marks: Deque[Tuple[float, float]] = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def advance(self, nbytes: int) -> None:
+        self._bytes += nbytes
+        with self._lock:
+            self._marks.append((self._bytes / self._bytes_per_ms, time.monotonic()))
+
+    def written_at(self, audio_ms: float) -> Optional[float]:
+        """audio_ms 위치가 포함된 청크를 쓴 시각. 이미 밀려난 위치면 None"""
+        with self._lock:
+            marks = list(self._marks)
+        found = None
+        # 결과는 보통 최근 오디오에 대한 것이므로 뒤에서부터 찾는다
+        for position, at in reversed(marks):
+            if position < audio_ms:
+                return found
+            found = at
+        # 처음까지 거슬러 올라감: 앞부분이 밀려났다면 정확한 시각을 알 수 없음
+        return found if len(marks) < self._marks.maxlen else None
+
+
+# Azure 대화 전사의 화자 id 규칙: 먼저 말한 사람이 "Guest-1" (= 마이크를 든 사용자로 간주)
+SELF_SPEAKER_ID = "Guest-1"
+
+
+def is_self_speaker(speaker_id: Optional[str]) -> bool:
+    """Guest-N 화자 id → 본인 여부. id 가 없으면(미확정) 본인으로 본다"""
+    return (speaker_id or SELF_SPEAKER_ID) == SELF_SPEAKER_ID
+
+
+class SttStreamError(Exception):
+    """인식 스트림이 끊기거나 멈춰서 더 이상 오디오를 받을 수 없음"""
+
+
+# 백엔드에 따라 SDK 스레드 또는 이벤트 루프 스레드에서 호출될 수 있음
+ResultCallback = Callable[[SttResult], None]
+
+
+class SttBackend(ABC):
+    """
+    실시간 STT 백엔드 인터페이스.
+    start() → write(chunk) 반복 → stop()
+    최종 결과는 생성자에서 받은 on_result 콜백으로 전달
+    """
+    name = ""
+
+    def __init__(self, on_result: ResultCallback):
+        self._on_result = on_result
+        self._started_at: Optional[float] = None
+        self._first_result = True
+        self._clock = AudioClock(settings.SPEECH_SAMPLE_RATE)
+
+    def _emit(self, result: SttResult) -> None:
+        if self._first_result and self._started_at is not None:
+            self._first_result = False
+            logger.info(
+                "STT first result (%s): %.0f ms after start",
+                self.name, (time.monotonic() - self._started_at) * 1000
+            )
+        if result.audio_end_ms is not None:
+            written_at = self._clock.written_at(result.audio_end_ms)
+            if written_at is not None:
+                STT_FINALIZATION_SECONDS.observe(
+                    max(time.monotonic() - written_at, 0.0), backend=self.name
+                )
+        self._on_result(result)
+
+    @abstractmethod
+    async def start(self) -> None:
+        ...
+
+    async def write(self, chunk: bytes) -> None:
+        """PCM16 mono 청크 전달 (STT 완료 지연 측정을 위해 위치/시각을 기록)"""
+        self._clock.advance(len(chunk))
+        await self._write(chunk)
+
+    @abstractmethod
+    async def _write(self, chunk: bytes) -> None:
+        ...
+
+    @abstractmethod
+    async def stop(self) -> None:
+        ...
@@ -0,0 +1,117 @@
+import asyncio
+import contextlib
+import json
+import logging
+import time
+from typing import AsyncIterator, Optional
+
+import grpc
+
+import nest_pb2
+import nest_pb2_grpc
+from core.config import settings
+from services.stt.base import SttBackend, SttResult, SttStreamError
+
+logger = logging.getLogger("rendi_api")
+
+
+class NestSttBackend(SttBackend):
+    """
+    CLOVA Speech Nest (gRPC bidirectional streaming, grpc.aio).
+    CONFIG 요청 1건 후 DATA 청크를 흘려보내고, 응답 스트림은 별도 태스크에서 읽는다.
+    결과 콜백은 이벤트 루프 스레드에서 호출됨.
+    화자 분리가 없어서 speaker_id 는 항상 None, 모든 발화가 "나" 로 기록된다
+    """
+    name = "nest"
+
+    async def start(self) -> None:
+        self._queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue(
+            maxsize=settings.CLOVA_NEST_QUEUE_MAXSIZE
+        )
+        self._channel = grpc.aio.secure_channel(
+            settings.CLOVA_NEST_ENDPOINT, grpc.ssl_channel_credentials()
+        )
+        stub = nest_pb2_grpc.NestServiceStub(self._channel)
+        self._call = stub.recognize(
+            self._requests(),
+            metadata=(("authorization", f"Bearer {settings.CLOVA_NEST_SECRET_KEY}"),),
+        )
+        self._started_at = time.monotonic()
+        self._reader = asyncio.create_task(self._read())
+
+    async def _requests(self) -> AsyncIterator[nest_pb2.NestRequest]:
+        config = {"transcription": {"language": settings.CLOVA_NEST_LANGUAGE}}
+        yield nest_pb2.NestRequest(
+            type=nest_pb2.RequestType.CONFIG,
+            config=nest_pb2.NestConfig(config=json.dumps(config)),
+        )
+        seq = 0
+        while True:
+            chunk = await self._queue.get()
+            last = chunk is None
+            yield nest_pb2.NestRequest(
+                type=nest_pb2.RequestType.DATA,
+                data=nest_pb2.NestData(
+                    chunk=b"" if last else chunk,
+                    extra_contents=json.dumps({"seqId": seq, "epFlag": last}),
+                ),
+            )
+            if last:
+                return
+            seq += 1
+
+    async def _read(self) -> None:
+        try:
+            async for resp in self._call:
+                try:
+                    contents = json.loads(resp.contents)
+                except ValueError:
+                    continue
+                tr = contents.get("transcription") or {}
+                text = (tr.get("text") or "").strip()
+                if not text:
+                    # config 응답 등
+                    continue
+                # 스트리밍 인식은 화자 분리를 지원하지 않으므로 모든 발화를 본인 발화로 보낸다
+                self._emit(SttResult(
+                    text=text,
+                    is_self=True,
+                    audio_end_ms=tr.get("endTimestamp"),
+                ))
+        except grpc.aio.AioRpcError as e:
+            if e.code() != grpc.StatusCode.CANCELLED:
+                logger.error("Nest STT stream error: %s %s", e.code(), e.details())
+
+    async def _write(self, chunk: bytes) -> None:
+        # 응답 스트림이 끝났으면(gRPC 오류 등) 요청 큐를 비울 쪽이 없다
+        if self._reader.done():
+            raise SttStreamError("Nest STT stream closed")
+        if not self._queue.full():
+            self._queue.put_nowait(chunk)
+            return
+        # 큐가 가득 차면 대기 → 소켓 수신 루프에 자연스럽게 backpressure.
+        # 그 사이 스트림이 끊기거나 너무 오래 멈추면 오류로 올려서 세션을 정리하게 한다
+        put = asyncio.ensure_future(self._queue.put(chunk))
+        await asyncio.wait(
+            {put, self._reader},
+            timeout=settings.CLOVA_NEST_WRITE_TIMEOUT,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        if not put.done():
+            put.cancel()
+            reason = "closed" if self._reader.done() else "stalled"
+            raise SttStreamError(f"Nest STT stream {reason}")
+
+    async def stop(self) -> None:
+        try:
+            if not self._reader.done():
+                # 큐가 가득 차 있어도 종료 마커(epFlag)는 버리지 않고 자리가 날 때까지 기다린다
+                await asyncio.wait_for(self._queue.put(None), settings.CLOVA_NEST_STOP_TIMEOUT)
+            await asyncio.wait_for(asyncio.shield(self._reader), settings.CLOVA_NEST_STOP_TIMEOUT)
+        except Exception:
+            # 마지막 결과를 기다리다 시간 초과/오류 → 스트림 강제 종료
+            self._call.cancel()
+            self._reader.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await self._reader
+        await self._channel.close()
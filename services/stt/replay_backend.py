@@ -0,0 +1,104 @@
+import asyncio
+import json
+import time
+from typing import Any, Dict, List
+
+from core.config import settings
+from services.stt.base import SttBackend, SttResult, is_self_speaker
+
+# STT_REPLAY_SCRIPT 가 없을 때 쓰는 기본 대본
+DEFAULT_SCRIPT: List[Dict[str, Any]] = [
+    {"text": "안녕하세요, 처음 뵙겠습니다.", "speaker_id": "Guest-1"},
+    {"text": "네 안녕하세요! 오시는 데 어렵지 않으셨어요?", "speaker_id": "Guest-2"},
+    {"text": "아니요, 지하철 타고 금방 왔어요.", "speaker_id": "Guest-1"},
+    {"text": "주말에는 보통 뭐 하면서 보내세요?", "speaker_id": "Guest-2"},
+    {"text": "요즘은 러닝을 시작해서 아침마다 뛰고 있어요.", "speaker_id": "Guest-1"},
+    {"text": "와 부지런하시네요. 저는 집에서 쉬는 편이에요.", "speaker_id": "Guest-2"},
+]
+
+
+def load_script() -> List[Dict[str, Any]]:
+    if not settings.STT_REPLAY_SCRIPT:
+        return DEFAULT_SCRIPT
+    with open(settings.STT_REPLAY_SCRIPT, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class ReplaySttBackend(SttBackend):
+    """
+    부하 테스트용 가짜 STT. Azure/CLOVA 없이 대본의 발화를 최종 결과로 내보낸다.
+    대본 항목: {"text", "speaker_id"?, "at_ms"?}
+    - at_ms 가 없으면 STT_REPLAY_INTERVAL_MS 간격으로 배치
+    - STT_REPLAY_CLOCK=audio: 받은 오디오(PCM16, SPEECH_SAMPLE_RATE) 위치가 at_ms 를 넘으면
+      wall: 시작 후 경과 시간이 at_ms 를 넘으면
+      (두 경우 모두 STT_REPLAY_FINALIZE_MS 만큼 늦게 결과 전달 → STT 확정 지연 흉내)
+    - STT_REPLAY_LOOP=true 면 대본 끝에서 처음부터 반복
+    """
+    name = "replay"
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._script = load_script()
+        self._index = 0
+        self._offset_ms = 0.0  # 반복 재생 시 누적 오프셋
+        self._audio_bytes = 0
+        self._stopped = False
+        self._started_at = time.monotonic()
+        self._clock_task = None
+        if settings.STT_REPLAY_CLOCK == "wall":
+            self._clock_task = asyncio.create_task(self._wall_clock())
+
+    def _at_ms(self, index: int) -> float:
+        entry = self._script[index]
+        at = entry.get("at_ms")
+        if at is None:
+            at = (index + 1) * settings.STT_REPLAY_INTERVAL_MS
+        return self._offset_ms + at
+
+    def _next_due(self, now_ms: float) -> List[Dict[str, Any]]:
+        due = []
+        while not self._stopped and self._script:
+            if self._index >= len(self._script):
+                end = self._at_ms(len(self._script) - 1)
+                if not settings.STT_REPLAY_LOOP or end <= self._offset_ms:
+                    break
+                self._offset_ms = end
+                self._index = 0
+            at = self._at_ms(self._index)
+            if at > now_ms:
+                break
+            due.append({**self._script[self._index], "at_ms": at})
+            self._index += 1
+        return due
+
+    def _schedule(self, entries: List[Dict[str, Any]]) -> None:
+        for entry in entries:
+            result = SttResult(
+                text=entry["text"],
+                speaker_id=entry.get("speaker_id"),
+                is_self=is_self_speaker(entry.get("speaker_id")),
+                # wall 모드의 시각은 오디오 위치가 아니므로 완료 지연 측정에서 제외
+                audio_end_ms=entry["at_ms"] if settings.STT_REPLAY_CLOCK == "audio" else None,
+            )
+            self._loop.call_later(settings.STT_REPLAY_FINALIZE_MS / 1000, self._deliver, result)
+
+    def _deliver(self, result: SttResult) -> None:
+        if not self._stopped:
+            self._emit(result)
+
+    async def _wall_clock(self) -> None:
+        while not self._stopped:
+            self._schedule(self._next_due((time.monotonic() - self._started_at) * 1000))
+            await asyncio.sleep(0.02)
+
+    async def _write(self, chunk: bytes) -> None:
+        if settings.STT_REPLAY_CLOCK != "audio":
+            return
+        self._audio_bytes += len(chunk)
+        audio_ms = self._audio_bytes / (settings.SPEECH_SAMPLE_RATE * 2) * 1000
+        self._schedule(self._next_due(audio_ms))
+
+    async def stop(self) -> None:
+        self._stopped = True
+        if self._clock_task:
+            self._clock_task.cancel()
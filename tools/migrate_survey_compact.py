@@ -0,0 +1,99 @@
+"""
+행 단위 설문 답변(lifestyle/trait/preference/values/introduction 테이블)을
+survey_section_answers (사용자 x 섹션당 JSON 1행) 로 일괄 이전한다.
+
+    python tools/migrate_survey_compact.py --batch-size 500
+    python tools/migrate_survey_compact.py --dry-run
+
+SURVEY_STORAGE=compact 로 바꾼 뒤 실행한다. 이전하지 않은 사용자도 읽기는 기존 테이블로
+폴백하고, 처음 저장할 때 옮겨지므로 서비스 중에 나눠서 돌려도 된다.
+이미 compact 행이 있는 사용자는 그쪽이 최신이므로 기존 행만 정리한다.
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, select  # noqa: E402
+
+from core.database import AsyncSessionLocal, Base, engine  # noqa: E402
+from crud import SURVEY_SECTIONS, insert_ignore_conflicts  # noqa: E402
+from models import SurveySectionAnswer  # noqa: E402
+
+
+async def migrate_section(model_cls, section: str, args) -> int:
+    value_col = model_cls.text if hasattr(model_cls, "text") else model_cls.option_id
+    migrated = 0
+    last_user_id = 0
+    async with AsyncSessionLocal() as db:
+        while True:
+            r = await db.execute(
+                select(model_cls.user_id)
+                .where(model_cls.user_id > last_user_id)
+                .distinct()
+                .order_by(model_cls.user_id)
+                .limit(args.batch_size)
+            )
+            user_ids = r.scalars().all()
+            if not user_ids:
+                break
+            last_user_id = user_ids[-1]
+
+            r = await db.execute(
+                select(model_cls.user_id, model_cls.question_id, value_col)
+                .where(model_cls.user_id.in_(user_ids))
+                .order_by(model_cls.id)
+            )
+            per_user = {}
+            for user_id, question_id, value in r.all():
+                per_user.setdefault(user_id, {}).setdefault(str(question_id), []).append(value)
+
+            r = await db.execute(
+                select(SurveySectionAnswer.user_id).where(
+                    SurveySectionAnswer.section == section,
+                    SurveySectionAnswer.user_id.in_(user_ids)
+                )
+            )
+            existing = set(r.scalars().all())
+            new_rows = [
+                {"user_id": user_id, "section": section, "data": data}
+                for user_id, data in per_user.items()
+                if user_id not in existing
+            ]
+            if not args.dry_run:
+                # 조회 이후 API 저장이 먼저 만든 행은 그쪽이 최신이므로 건너뛴다
+                await insert_ignore_conflicts(db, SurveySectionAnswer, new_rows, ("user_id", "section"))
+                if not args.keep_legacy:
+                    await db.execute(delete(model_cls).where(model_cls.user_id.in_(user_ids)))
+                await db.commit()
+            migrated += len(new_rows)
+            print(f"{section}: {migrated} users migrated (last user_id={last_user_id})")
+    return migrated
+
+
+async def main_async(args) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        for model_cls, section in SURVEY_SECTIONS.items():
+            if args.section and section not in args.section:
+                continue
+            total = await migrate_section(model_cls, section, args)
+            print(f"{section}: done, {total} users{' (dry run)' if args.dry_run else ''}")
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500, help="한 트랜잭션에서 옮길 사용자 수")
+    parser.add_argument("--section", nargs="*", choices=sorted(SURVEY_SECTIONS.values()))
+    parser.add_argument("--keep-legacy", action="store_true", help="옮긴 뒤 기존 행을 지우지 않음")
+    parser.add_argument("--dry-run", action="store_true")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
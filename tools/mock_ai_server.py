@@ -0,0 +1,115 @@
+"""
+AI_SERVER_URL 대역 로컬 목(mock) 서버. 외부 AI 서버 없이 /ws/speech 전체 경로를 부하 테스트할 때 사용.
+
+    python tools/mock_ai_server.py --port 9001 --latency-ms 300 --final-report-latency-ms 3000
+    AI_SERVER_URL=http://127.0.0.1:9001 STT_BACKEND=replay uvicorn main:app
+
+단계별 지연은 --latency-ms 기본값에 --<stage>-latency-ms 로 덮어쓰고,
+--jitter-ms 만큼 무작위로 흔든다. --payload-bytes 로 응답 크기를 키울 수 있다.
+"""
+import argparse
+import asyncio
+import random
+import uuid
+from typing import Any, Dict
+
+import uvicorn
+from fastapi import FastAPI, Request
+
+STAGES = ("conversation", "messages", "realtime_memory", "realtime_analysis",
+          "recommendation", "advice_detail", "final_report")
+
+config: Dict[str, Any] = {
+    "latency_ms": {stage: 200.0 for stage in STAGES},
+    "jitter_ms": 50.0,
+    "payload_bytes": 256,
+    "advices": 3,
+}
+
+app = FastAPI(title="Mock AI server")
+
+
+async def _delay(stage: str):
+    ms = config["latency_ms"][stage] + random.uniform(-1, 1) * config["jitter_ms"]
+    await asyncio.sleep(max(ms, 0) / 1000)
+
+
+def _filler() -> str:
+    return "가" * (config["payload_bytes"] // 3)  # 한글 1자 = UTF-8 3바이트
+
+
+@app.post("/api/v1/conversation/{conversation_id}")
+async def create_conversation(conversation_id: str):
+    await _delay("conversation")
+    return {"conversation_id": conversation_id}
+
+
+@app.post("/api/v1/conversation/{conversation_id}/messages")
+async def messages(conversation_id: str, request: Request):
+    body = await request.json()
+    await _delay("messages")
+    return {
+        "message": body.get("message", {}),
+        "scores": {"interest": random.randint(0, 100), "comfort": random.randint(0, 100)},
+    }
+
+
+@app.post("/api/v1/conversation/{conversation_id}/realtime-memory")
+async def realtime_memory(conversation_id: str):
+    await _delay("realtime_memory")
+    return {"partner_memory": {"summary": _filler()}}
+
+
+@app.get("/api/v1/conversation/{conversation_id}/realtime-analysis")
+async def realtime_analysis(conversation_id: str):
+    await _delay("realtime_analysis")
+    return {"scores": {"tone": random.random(), "balance": random.random(), "note": _filler()}}
+
+
+@app.post("/api/v1/conversation/{conversation_id}/breaktime-advice/recommendation")
+async def recommendation(conversation_id: str):
+    await _delay("recommendation")
+    return {
+        "advice_metadatas": [
+            {"advice_id": uuid.uuid4().hex[:8], "title": f"조언 {i + 1}"}
+            for i in range(config["advices"])
+        ]
+    }
+
+
+@app.post("/api/v1/conversation/{conversation_id}/breaktime-advice/{advice_id}")
+async def advice_detail(conversation_id: str, advice_id: str):
+    await _delay("advice_detail")
+    return {"advice_id": advice_id, "content": _filler()}
+
+
+@app.post("/api/v1/conversation/{conversation_id}/final-report")
+async def final_report(conversation_id: str):
+    await _delay("final_report")
+    return {"final_report": _filler()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9001)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--payload-bytes", type=int, default=256)
+    parser.add_argument("--advices", type=int, default=3, help="추천 조언 개수")
+    for stage in STAGES:
+        parser.add_argument(f"--{stage.replace('_', '-')}-latency-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    for stage in STAGES:
+        override = getattr(args, f"{stage}_latency_ms")
+        config["latency_ms"][stage] = args.latency_ms if override is None else override
+    config["jitter_ms"] = args.jitter_ms
+    config["payload_bytes"] = args.payload_bytes
+    config["advices"] = args.advices
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+-- crud.upsert_returning(INSERT ... ON CONFLICT / ON DUPLICATE KEY) 가 쓰는 유니크 키 추가.
+-- create_all 은 기존 테이블에 제약을 추가하지 않으므로 운영 DB 에는 이 스크립트를 한 번 실행한다. (PostgreSQL)
+-- profile_initial.user_id 는 이미 UNIQUE (profile_initial_user_id_key).
+-- 중복 행은 가장 최근(id 최대) 것만 남긴다.
+
+BEGIN;
+
+DELETE FROM user_checklists a
+USING user_checklists b
+WHERE a.user_id = b.user_id
+  AND a.item_id = b.item_id
+  AND a.id < b.id;
+
+ALTER TABLE user_checklists
+    ADD CONSTRAINT uq_user_checklist_item UNIQUE (user_id, item_id);
+
+DELETE FROM schedules a
+USING schedules b
+WHERE a.user_id = b.user_id
+  AND a.id < b.id;
+
+-- 유니크 제약이 인덱스를 겸하므로 기존 단일 인덱스는 제거
+DROP INDEX IF EXISTS ix_schedules_user_id;
+ALTER TABLE schedules
+    ADD CONSTRAINT schedules_user_id_key UNIQUE (user_id);
+
+COMMIT;
+
+-- MySQL:
+--   DELETE a FROM user_checklists a JOIN user_checklists b
+--     ON a.user_id = b.user_id AND a.item_id = b.item_id AND a.id < b.id;
+--   ALTER TABLE user_checklists ADD CONSTRAINT uq_user_checklist_item UNIQUE (user_id, item_id);
+--   DELETE a FROM schedules a JOIN schedules b ON a.user_id = b.user_id AND a.id < b.id;
+--   ALTER TABLE schedules ADD CONSTRAINT schedules_user_id_key UNIQUE (user_id);
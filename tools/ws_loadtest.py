@@ -0,0 +1,311 @@
+"""
+/ws/speech 동시 세션 부하 생성기. static/ws_test.html 과 같은 프로토콜
+(access_token 쿠키, PCM16 mono 프레임)을 사용한다.
+
+    python tools/ws_loadtest.py --url ws://127.0.0.1:8000/ws/speech --sessions 50 \\
+        --duration 60 --stream --secret-key $SECRET_KEY --sub <google_id> --output run.json
+
+오디오는 --wav 파일(16bit PCM, --sample-rate 와 같은 샘플레이트)을 순서대로 쓰고,
+없으면 합성음(톤 1.5초 + 무음 1초 반복)을 보낸다.
+
+지연 측정 기준점은 응답을 만든 발화가 끝난 시각이다.
+- 기본: 소리가 있던 프레임(RMS > --vad-threshold) 뒤로 --end-silence-ms 이상 무음이 이어지면
+  마지막 유성 프레임을 보낸 시각을 발화 끝으로 큐에 넣는다
+- --replay-interval-ms: replay STT 백엔드(STT_REPLAY_CLOCK=audio, at_ms 없는 대본)용.
+  보낸 오디오 위치가 간격의 배수를 넘는 프레임을 보낸 시각을 발화 끝으로 쓴다
+transcript(또는 기존 모드의 envelope)는 아직 짝이 없는 가장 오래된 발화 끝과 짝지어진다.
+- time_to_transcript: 발화 끝 → transcript 프레임 (--stream 일 때만)
+- time_to_full_envelope: 발화 끝 → done 프레임(--stream) 또는 envelope(기존 모드)
+  (기존 모드에서 서버가 여러 발화를 합쳐 envelope 하나로 보내면 이후 짝이 한 칸씩 밀린다)
+결과는 JSON 으로 출력해서 실행 간 비교에 쓴다.
+"""
+import argparse
+import array
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+import wave
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+
+import websockets
+from jose import jwt
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """nearest-rank"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(p / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    return {
+        "count": len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "mean": sum(values) / len(values) if values else None,
+        "max": max(values) if values else None,
+    }
+
+
+def load_wav(path: str, sample_rate: int) -> bytes:
+    with wave.open(path, "rb") as w:
+        if w.getsampwidth() != 2:
+            raise SystemExit(f"{path}: 16bit PCM 만 지원합니다")
+        if w.getframerate() != sample_rate:
+            raise SystemExit(f"{path}: 샘플레이트 {w.getframerate()} != {sample_rate}")
+        pcm = array.array("h", w.readframes(w.getnframes()))
+        channels = w.getnchannels()
+    if channels > 1:
+        pcm = pcm[::channels]  # 첫 채널만 사용
+    if sys.byteorder != "little":
+        pcm.byteswap()
+    return pcm.tobytes()
+
+
+def synthetic_audio(sample_rate: int, tone_s: float = 1.5, silence_s: float = 1.0) -> bytes:
+    tone = array.array("h", (
+        int(8000 * math.sin(2 * math.pi * 440 * i / sample_rate))
+        for i in range(int(sample_rate * tone_s))
+    ))
+    silence = array.array("h", bytes(int(sample_rate * silence_s) * 2))
+    pcm = tone + silence
+    if sys.byteorder != "little":
+        pcm.byteswap()
+    return pcm.tobytes()
+
+
+def rms(frame: bytes) -> float:
+    pcm = array.array("h", frame)
+    if sys.byteorder != "little":
+        pcm.byteswap()
+    if not pcm:
+        return 0.0
+    return math.sqrt(sum(s * s for s in pcm) / len(pcm))
+
+
+@dataclass
+class SessionStats:
+    time_to_transcript: List[float] = field(default_factory=list)
+    time_to_full_envelope: List[float] = field(default_factory=list)
+    frames_sent: int = 0
+    dropped_frames: int = 0
+    server_errors: int = 0
+    connect_failed: bool = False
+    abnormal_close: bool = False
+    rejected: bool = False  # 서버 수용 한도 초과 (close 1013)
+    error_samples: List[str] = field(default_factory=list)
+
+
+async def run_session(index: int, args, audio_clips: List[bytes], token: str) -> SessionStats:
+    stats = SessionStats()
+    frame_bytes = args.sample_rate * args.frame_ms // 1000 * 2
+    interval = args.frame_ms / 1000
+    # 아직 응답과 짝지어지지 않은 발화 끝 시각 (오래된 순)
+    utterance_ends: Deque[float] = deque()
+    refs: Dict[str, float] = {}  # utterance_id -> 기준 시각
+    clip = audio_clips[index % len(audio_clips)]
+    url = (args.url + ("&" if "?" in args.url else "?") + "stream=1") if args.stream else args.url
+
+    def error(msg: str):
+        stats.server_errors += 1
+        if len(stats.error_samples) < 5:
+            stats.error_samples.append(msg)
+
+    try:
+        ws = await websockets.connect(
+            url, extra_headers={"Cookie": f"access_token={token}"}, max_size=None
+        )
+    except Exception as e:
+        stats.connect_failed = True
+        error(f"connect: {e}")
+        return stats
+
+    async def sender():
+        start = time.monotonic()
+        deadline = start + args.duration
+        n = 0
+        pos = 0
+        audio_ms = 0.0  # 서버에 실제로 보낸 오디오 위치
+        last_voiced_at: Optional[float] = None
+        silence_ms = 0.0
+        while True:
+            due = start + n * interval
+            now = time.monotonic()
+            if due >= deadline:
+                break
+            if now - due > interval:
+                # 실시간보다 한 프레임 이상 밀림 → 이 프레임은 버린다
+                stats.dropped_frames += 1
+            else:
+                if due > now:
+                    await asyncio.sleep(due - now)
+                frame = clip[pos:pos + frame_bytes]
+                if len(frame) < frame_bytes:
+                    pos = 0
+                    frame = clip[:frame_bytes]
+                await ws.send(frame)
+                sent_at = time.monotonic()
+                stats.frames_sent += 1
+                prev_ms, audio_ms = audio_ms, audio_ms + args.frame_ms
+                if args.replay_interval_ms:
+                    if audio_ms // args.replay_interval_ms > prev_ms // args.replay_interval_ms:
+                        utterance_ends.append(sent_at)
+                elif rms(frame) > args.vad_threshold:
+                    last_voiced_at = sent_at
+                    silence_ms = 0.0
+                elif last_voiced_at is not None:
+                    silence_ms += args.frame_ms
+                    if silence_ms >= args.end_silence_ms:
+                        utterance_ends.append(last_voiced_at)
+                        last_voiced_at = None
+            pos = (pos + frame_bytes) % max(len(clip), 1)
+            n += 1
+        if last_voiced_at is not None:
+            # 소리가 나는 중에 전송이 끝남: 마지막 유성 프레임을 발화 끝으로 본다
+            utterance_ends.append(last_voiced_at)
+        if args.end:
+            await ws.send(json.dumps({"type": "end"}))
+
+    async def receiver():
+        async for raw in ws:
+            now = time.monotonic()
+            try:
+                msg = json.loads(raw)
+            except ValueError:
+                error("non-json frame")
+                continue
+            kind = msg.get("type")
+            if kind == "error" and "retry_after" in msg:
+                continue  # 수용 거절: 곧 1013 으로 닫힘
+            if kind == "error" or (kind is None and "error" in msg):
+                error(str(msg.get("error")))
+                continue
+            if msg.get("stage_errors"):
+                error(f"stage_errors: {msg['stage_errors']}")
+            if kind == "transcript":
+                ref = utterance_ends.popleft() if utterance_ends else None
+                if ref is not None:
+                    refs[msg["utterance_id"]] = ref
+                    stats.time_to_transcript.append((now - ref) * 1000)
+            elif kind == "done":
+                ref = refs.pop(msg.get("utterance_id"), None)
+                if ref is not None:
+                    stats.time_to_full_envelope.append((now - ref) * 1000)
+            elif kind is None and "message" in msg:
+                # 기존 모드: 발화당 envelope 1개
+                ref = utterance_ends.popleft() if utterance_ends else None
+                if ref is not None:
+                    stats.time_to_full_envelope.append((now - ref) * 1000)
+            elif kind == "final_report" and msg.get("final"):
+                return
+
+    recv_task = asyncio.create_task(receiver())
+    try:
+        await sender()
+        try:
+            await asyncio.wait_for(asyncio.shield(recv_task), args.drain)
+        except asyncio.TimeoutError:
+            pass
+    except websockets.ConnectionClosed:
+        pass
+    finally:
+        recv_task.cancel()
+        await asyncio.gather(recv_task, return_exceptions=True)
+        await ws.close()
+        if ws.close_code == 1013:
+            stats.rejected = True
+        elif ws.close_code not in (None, 1000, 1005):
+            stats.abnormal_close = True
+            error(f"close {ws.close_code}: {ws.close_reason}")
+    return stats
+
+
+async def main_async(args) -> Dict:
+    token = args.token
+    if not token:
+        if not args.secret_key or not args.sub:
+            raise SystemExit("--token 또는 --secret-key/--sub 가 필요합니다")
+        token = jwt.encode(
+            {"sub": args.sub, "exp": int(time.time()) + int(args.duration) + 3600},
+            args.secret_key, algorithm=args.algorithm
+        )
+    clips = [load_wav(p, args.sample_rate) for p in args.wav] or [synthetic_audio(args.sample_rate)]
+
+    async def delayed(i: int):
+        await asyncio.sleep(args.ramp_up * i / max(args.sessions, 1))
+        return await run_session(i, args, clips, token)
+
+    started = time.time()
+    results = await asyncio.gather(*(delayed(i) for i in range(args.sessions)))
+    return {
+        "started_at": started,
+        "wall_seconds": time.time() - started,
+        "config": {
+            "url": args.url,
+            "sessions": args.sessions,
+            "duration": args.duration,
+            "stream": args.stream,
+            "sample_rate": args.sample_rate,
+            "frame_ms": args.frame_ms,
+            "utterance_end": (
+                f"replay_interval:{args.replay_interval_ms}" if args.replay_interval_ms
+                else f"vad:{args.vad_threshold}/{args.end_silence_ms}ms"
+            ),
+            "audio": args.wav or ["synthetic"],
+        },
+        "time_to_transcript_ms": summarize([v for r in results for v in r.time_to_transcript]),
+        "time_to_full_envelope_ms": summarize([v for r in results for v in r.time_to_full_envelope]),
+        "frames_sent": sum(r.frames_sent for r in results),
+        "dropped_frames": sum(r.dropped_frames for r in results),
+        "server_errors": sum(r.server_errors for r in results),
+        "connect_failures": sum(r.connect_failed for r in results),
+        "abnormal_closes": sum(r.abnormal_close for r in results),
+        "rejected_sessions": sum(r.rejected for r in results),
+        "error_samples": [e for r in results for e in r.error_samples][:20],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="ws://127.0.0.1:8000/ws/speech")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30.0, help="세션당 오디오 전송 시간(초)")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="세션 접속을 이 시간(초)에 걸쳐 분산")
+    parser.add_argument("--drain", type=float, default=10.0, help="전송 종료 후 응답 대기 시간(초)")
+    parser.add_argument("--stream", action="store_true", help="?stream=1 스트리밍 모드")
+    parser.add_argument("--end", action="store_true", help='전송 종료 후 {"type": "end"} 전송')
+    parser.add_argument("--wav", nargs="*", default=[])
+    parser.add_argument("--sample-rate", type=int, default=16000)
+    parser.add_argument("--frame-ms", type=int, default=20)
+    parser.add_argument("--vad-threshold", type=float, default=500.0)
+    parser.add_argument("--end-silence-ms", type=float, default=300.0, help="발화 끝으로 볼 최소 무음 길이")
+    parser.add_argument(
+        "--replay-interval-ms", type=float,
+        help="replay 백엔드의 STT_REPLAY_INTERVAL_MS. 지정하면 VAD 대신 오디오 위치로 발화 끝을 정한다"
+    )
+    parser.add_argument("--token", help="access_token 쿠키 값")
+    parser.add_argument("--secret-key", default=os.environ.get("SECRET_KEY"))
+    parser.add_argument("--algorithm", default=os.environ.get("ALGORITHM", "HS256"))
+    parser.add_argument("--sub", help="토큰 sub (google_id)")
+    parser.add_argument("--output", help="결과 JSON 파일 (기본: stdout)")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()